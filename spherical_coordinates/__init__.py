@@ -2,6 +2,16 @@ from .version import __version__
 from . import corsika
 from . import dimensionality
 from . import random
+from . import parallel
+from . import cache
+from . import lazy
+from . import projection
+from . import memo
+from . import octahedral
+from . import propagation
+from . import jacobian
+from . import circular
+from . import statistics
 
 from .base import azimuth_range
 from .base import az_zd_to_cx_cy_cz
@@ -14,3 +24,4 @@ from .base import angle_between_cx_cy
 from .base import angle_between_az_zd
 from .base import restore_cz
 from .base import arccos_accepting_numeric_tolerance
+from .base import is_az_zd_in_box
@@ -19,14 +19,14 @@ def azimuth_range(azimuth_rad):
     """
     PI = np.pi
     TAU = 2.0 * PI
-    is_scalar, azimuth_rad = dimensionality._in(x=azimuth_rad)
+    xp = dimensionality._namespace(azimuth_rad)
+    is_scalar, azimuth_rad = dimensionality._in(x=azimuth_rad, xp=xp)
     # force azimuth to be the positive remainder, so that 0 <= angle < TAU
     azimuth_rad = azimuth_rad % TAU
     azimuth_rad = (azimuth_rad + TAU) % TAU
     # force into the minimum absolute value residue class
     # so that: -PI < azimuth <= PI
-    mask = azimuth_rad > PI
-    azimuth_rad[mask] -= TAU
+    azimuth_rad = xp.where(azimuth_rad > PI, azimuth_rad - TAU, azimuth_rad)
     return dimensionality._out(is_scalar, x=azimuth_rad)
 
 
@@ -49,13 +49,17 @@ def az_zd_to_cx_cy_cz(azimuth_rad, zenith_rad):
 
     See also the inverse: cx_cy_cz_to_az_zd()
     """
+    xp = dimensionality._namespace(azimuth_rad, zenith_rad)
     azimuth_rad = azimuth_range(azimuth_rad=azimuth_rad)
+    if xp is not np:
+        azimuth_rad = dimensionality._asarray(x=azimuth_rad, xp=xp)
+        zenith_rad = dimensionality._asarray(x=zenith_rad, xp=xp)
     # Adopted from KIT's CORSIKA
     az = azimuth_rad
     zd = zenith_rad
-    cx = np.cos(az) * np.sin(zd)
-    cy = np.sin(az) * np.sin(zd)
-    cz = np.cos(zd)
+    cx = xp.cos(az) * xp.sin(zd)
+    cy = xp.sin(az) * xp.sin(zd)
+    cz = xp.cos(zd)
     return cx, cy, cz
 
 
@@ -114,12 +118,14 @@ def cx_cy_to_az_zd(cx, cy):
     See inverse: az_zd_to_cx_cy()
     """
 
+    xp = dimensionality._namespace(cx, cy)
+    cx_is_scalar, cx = dimensionality._in(x=cx, xp=xp)
+    cy_is_scalar, cy = dimensionality._in(x=cy, xp=xp)
+    is_scalar = cx_is_scalar and cy_is_scalar
     inner_sqrt = 1.0 - cx**2 - cy**2
-    is_scalar, inner_sqrt = dimensionality._in(x=inner_sqrt)
 
-    cz = np.nan * np.ones(len(inner_sqrt))
     fine = inner_sqrt >= 0
-    cz[fine] = np.sqrt(inner_sqrt)
+    cz = xp.sqrt(xp.where(fine, inner_sqrt, np.nan))
     az, zd = cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz)
 
     az = dimensionality._out(is_scalar=is_scalar, x=az)
@@ -147,7 +153,11 @@ def cx_cy_cz_to_az_zd(cx, cy, cz):
 
     See inverse: az_zd_to_cx_cy_cz()
     """
-    az = np.arctan2(cy, cx)
+    xp = dimensionality._namespace(cx, cy, cz)
+    if xp is not np:
+        cx = dimensionality._asarray(x=cx, xp=xp)
+        cy = dimensionality._asarray(x=cy, xp=xp)
+    az = dimensionality._atan2(xp, cy, cx)
     zd = arccos_accepting_numeric_tolerance(cz)
     return az, zd
 
@@ -177,16 +187,15 @@ def angle_between_cx_cy_cz(cx1, cy1, cz1, cx2, cy2, cz2):
     angle_rad : float
         The angle between the 1st and 2nd direction.
     """
-    dot = np.dot
-    norm = np.linalg.norm
+    xp = dimensionality._namespace(cx1, cy1, cz1, cx2, cy2, cz2)
 
-    cx1_is_scalar, cx1 = dimensionality._in(x=cx1)
-    cy1_is_scalar, cy1 = dimensionality._in(x=cy1)
-    cz1_is_scalar, cz1 = dimensionality._in(x=cz1)
+    cx1_is_scalar, cx1 = dimensionality._in(x=cx1, xp=xp)
+    cy1_is_scalar, cy1 = dimensionality._in(x=cy1, xp=xp)
+    cz1_is_scalar, cz1 = dimensionality._in(x=cz1, xp=xp)
 
-    cx2_is_scalar, cx2 = dimensionality._in(x=cx2)
-    cy2_is_scalar, cy2 = dimensionality._in(x=cy2)
-    cz2_is_scalar, cz2 = dimensionality._in(x=cz2)
+    cx2_is_scalar, cx2 = dimensionality._in(x=cx2, xp=xp)
+    cy2_is_scalar, cy2 = dimensionality._in(x=cy2, xp=xp)
+    cz2_is_scalar, cz2 = dimensionality._in(x=cz2, xp=xp)
 
     assert all([cx1_is_scalar == u for u in [cy1_is_scalar, cz1_is_scalar]])
     assert all([cx2_is_scalar == u for u in [cy2_is_scalar, cz2_is_scalar]])
@@ -194,12 +203,9 @@ def angle_between_cx_cy_cz(cx1, cy1, cz1, cx2, cy2, cz2):
     first_is_scalar = cx1_is_scalar
     second_is_scalar = cx2_is_scalar
 
-    norm1 = norm(np.c_[cx1, cy1, cz1], axis=1)
-    norm2 = norm(np.c_[cx2, cy2, cz2], axis=1)
-    xx = cx1 * cx2
-    yy = cy1 * cy2
-    zz = cz1 * cz2
-    dot12 = np.sum(np.c_[xx, yy, zz], axis=1)
+    norm1 = xp.sqrt(cx1 * cx1 + cy1 * cy1 + cz1 * cz1)
+    norm2 = xp.sqrt(cx2 * cx2 + cy2 * cy2 + cz2 * cz2)
+    dot12 = cx1 * cx2 + cy1 * cy2 + cz1 * cz2
     ret = arccos_accepting_numeric_tolerance(dot12 / (norm1 * norm2))
     return dimensionality._out(
         is_scalar=all([first_is_scalar, second_is_scalar]),
@@ -224,14 +230,16 @@ def angle_between_xyz(a, b):
     -------
     anglses : float or array, shape=(N,)
     """
-    a = np.array(a)
-    b = np.array(b)
+    xp = dimensionality._namespace(a, b)
+    if xp is np:
+        a = np.array(a)
+        b = np.array(b)
     assert a.shape == b.shape
     dim = len(a.shape)
     assert dim == 1 or dim == 2
     if dim == 1:
-        a = a.reshape((1, a.shape[0]))
-        b = b.reshape((1, b.shape[0]))
+        a = xp.reshape(a, (1, a.shape[0]))
+        b = xp.reshape(b, (1, b.shape[0]))
     ret = angle_between_cx_cy_cz(
         cx1=a[:, 0],
         cy1=a[:, 1],
@@ -241,7 +249,7 @@ def angle_between_xyz(a, b):
         cz2=b[:, 2],
     )
     if dim == 1:
-        return np.squeeze(ret)
+        return xp.reshape(ret, ())
     else:
         return ret
 
@@ -304,8 +312,9 @@ def restore_cz(cx, cy, eps=1e-6):
     eps : float
         Tolerance for (cx**2 + cy**2) - 1.0 <= eps.
     """
-    cx_is_scalar, cx = dimensionality._in(x=cx)
-    cy_is_scalar, cy = dimensionality._in(x=cy)
+    xp = dimensionality._namespace(cx, cy)
+    cx_is_scalar, cx = dimensionality._in(x=cx, xp=xp)
+    cy_is_scalar, cy = dimensionality._in(x=cy, xp=xp)
     assert cx_is_scalar == cy_is_scalar
 
     inner = cx**2 + cy**2
@@ -313,11 +322,11 @@ def restore_cz(cx, cy, eps=1e-6):
     assert eps >= 0.0
     mask_ge_one = inner >= 1.0
     mask_le_one_plus_epsilon = inner <= (1.0 + eps)
-    mask = np.logical_and(mask_ge_one, mask_le_one_plus_epsilon)
+    mask = xp.logical_and(mask_ge_one, mask_le_one_plus_epsilon)
 
-    inner[mask] = 1.0
+    inner = xp.where(mask, 1.0, inner)
 
-    ret = np.sqrt(1.0 - inner)
+    ret = xp.sqrt(1.0 - inner)
     return dimensionality._out(is_scalar=cy_is_scalar, x=ret)
 
 
@@ -338,13 +347,119 @@ def arccos_accepting_numeric_tolerance(x, eps=1e-6):
     -------
     angle : float
     """
-    is_scalar, x = dimensionality._in(x=x)
+    xp = dimensionality._namespace(x)
+    is_scalar, x = dimensionality._in(x=x, xp=xp)
 
     assert eps >= 0.0
-    mask = np.logical_and(x > 1.0, x < (1.0 + eps))
-    x[mask] = 1.0
-    mask = np.logical_and(x < -1.0, x > (-1.0 - eps))
-    x[mask] = -1.0
-    ret = np.arccos(x)
+    mask = xp.logical_and(x > 1.0, x < (1.0 + eps))
+    x = xp.where(mask, 1.0, x)
+    mask = xp.logical_and(x < -1.0, x > (-1.0 - eps))
+    x = xp.where(mask, -1.0, x)
+    ret = dimensionality._acos(xp, x)
 
     return dimensionality._out(is_scalar=is_scalar, x=ret)
+
+
+def is_az_zd_in_box(
+    azimuth_rad,
+    zenith_rad,
+    azimuth_start_rad,
+    azimuth_stop_rad,
+    zenith_start_rad,
+    zenith_stop_rad,
+    out=None,
+):
+    """
+    Returns whether pointings are inside a box in azimuth and zenith
+    distance. The box runs in positive (counter clockwise) azimuth from
+    azimuth_start_rad to azimuth_stop_rad and may cross the seam at +-PI
+    of azimuth_range(). The arrays are not split or copied. Because the
+    test is element wise, long arrays can be processed chunk by chunk.
+
+    Parameters
+    ----------
+    azimuth_rad : float or array like
+        Azimuth angle of pointings.
+    zenith_rad : float or array like
+        Zenith distance angle of pointings.
+    azimuth_start_rad : float
+        Azimuth where the box starts.
+    azimuth_stop_rad : float
+        Azimuth where the box stops. When it equals the start plus a
+        multiple of 2*PI, the box covers all azimuths.
+    zenith_start_rad : float
+        Lower zenith distance of box.
+    zenith_stop_rad : float
+        Upper zenith distance of box.
+    out : array of bools or None
+        Array to write the result into.
+
+    Returns
+    -------
+    inside : bool or array of bools
+        The array out if given.
+    """
+    assert zenith_start_rad <= zenith_stop_rad
+    width = _azimuth_width(
+        azimuth_start_rad=azimuth_start_rad, azimuth_stop_rad=azimuth_stop_rad
+    )
+    is_scalar, azimuth_rad = dimensionality._in(x=azimuth_rad)
+    _, zenith_rad = dimensionality._in(x=zenith_rad)
+    if out is None:
+        out = np.empty(shape=azimuth_rad.shape, dtype=bool)
+
+    delta = np.subtract(azimuth_rad, azimuth_start_rad, dtype=float)
+    np.mod(delta, 2.0 * np.pi, out=delta)
+    np.less_equal(delta, width, out=out)
+    out &= zenith_rad >= zenith_start_rad
+    out &= zenith_rad <= zenith_stop_rad
+
+    return dimensionality._out(is_scalar=is_scalar, x=out)
+
+
+def _azimuth_width(azimuth_start_rad, azimuth_stop_rad):
+    TAU = 2.0 * np.pi
+    width = (azimuth_stop_rad - azimuth_start_rad) % TAU
+    if width == 0.0 and azimuth_stop_rad != azimuth_start_rad:
+        width = TAU
+    return width
+
+
+def _rotation_matrix_az_zd(azimuth_rad, zenith_rad):
+    """
+    Returns the rotation matrix which turns the positive z-axis into the
+    pointing (azimuth, zenith distance). It first rotates around the y-axis
+    by the zenith distance and then around the z-axis by the azimuth just
+    like the rotation of the cone in KIT's CORSIKA.
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth angle of pointing.
+    zenith_rad : float
+        Zenith distance angle of pointing.
+
+    Returns
+    -------
+    rot : array, shape=(3, 3)
+        The columns are the images of the x-, y-, and z-axis.
+    """
+    cos_az = np.cos(azimuth_rad)
+    sin_az = np.sin(azimuth_rad)
+    cos_zd = np.cos(zenith_rad)
+    sin_zd = np.sin(zenith_rad)
+    rot_z = np.array(
+        [
+            [cos_az, -sin_az, 0.0],
+            [sin_az, cos_az, 0.0],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+    rot_y = np.array(
+        [
+            [cos_zd, 0.0, sin_zd],
+            [0.0, 1.0, 0.0],
+            [-sin_zd, 0.0, cos_zd],
+        ]
+    )
+    return np.matmul(rot_z, rot_y)
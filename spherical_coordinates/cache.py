@@ -0,0 +1,252 @@
+from .version import __version__
+from . import base
+import numpy as np
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import time
+
+MAX_CACHE_SIZE_BYTES = 1024**3
+MAX_NUM_ATTEMPTS = 4
+MAX_TMP_AGE_S = 3600.0
+TMP_PREFIX = ".tmp_"
+
+
+def default_cache_dir():
+    """
+    Returns the directory of the cache. This is the environment variable
+    SPHERICAL_COORDINATES_CACHE_DIR if set, or else
+    ~/.cache/spherical_coordinates.
+    """
+    path = os.environ.get("SPHERICAL_COORDINATES_CACHE_DIR", None)
+    if path is None:
+        path = os.path.join("~", ".cache", "spherical_coordinates")
+    return os.path.expanduser(path)
+
+
+def az_zd_grid(
+    num_azimuth_bins,
+    num_zenith_bins,
+    max_zenith_rad=np.pi / 2,
+    cache_dir=None,
+    max_cache_size_bytes=MAX_CACHE_SIZE_BYTES,
+):
+    """
+    Returns a dense grid of pointings (azimuth, zenith distance) and their
+    cartesian vectors (cx, cy, cz). The grid is computed once and stored in
+    the cache. Subsequent calls, also in other processes, map the stored
+    .npy files read only into memory without copying.
+
+    Parameters
+    ----------
+    num_azimuth_bins : int
+        Number of bins in azimuth within [-PI, +PI).
+    num_zenith_bins : int
+        Number of bins in zenith distance within [0, max_zenith_rad).
+    max_zenith_rad : float
+        Upper edge of the zenith distance bins.
+    cache_dir : str or None
+        Directory of the cache. Default is default_cache_dir().
+    max_cache_size_bytes : int
+        When a new entry is added, the least recently used entries are
+        removed until the cache is not larger than this.
+
+    Returns
+    -------
+    grid : dict of str -> array, shape=(num_azimuth_bins, num_zenith_bins)
+        Keys are 'azimuth_rad', 'zenith_rad', 'cx', 'cy', and 'cz'.
+        The pointings are the centers of the bins.
+    """
+    assert num_azimuth_bins > 0
+    assert num_zenith_bins > 0
+    assert 0.0 < max_zenith_rad <= np.pi
+
+    def build():
+        az_edges = np.linspace(-np.pi, np.pi, num_azimuth_bins + 1)
+        zd_edges = np.linspace(0.0, max_zenith_rad, num_zenith_bins + 1)
+        az_centers = 0.5 * (az_edges[0:-1] + az_edges[1:])
+        zd_centers = 0.5 * (zd_edges[0:-1] + zd_edges[1:])
+        az, zd = np.meshgrid(az_centers, zd_centers, indexing="ij")
+        cx, cy, cz = base.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+        return {
+            "azimuth_rad": az,
+            "zenith_rad": zd,
+            "cx": cx,
+            "cy": cy,
+            "cz": cz,
+        }
+
+    return _get(
+        kind="az_zd_grid",
+        params={
+            "num_azimuth_bins": int(num_azimuth_bins),
+            "num_zenith_bins": int(num_zenith_bins),
+            "max_zenith_rad": float(max_zenith_rad),
+        },
+        build=build,
+        cache_dir=cache_dir,
+        max_cache_size_bytes=max_cache_size_bytes,
+    )
+
+
+def rotation_matrices_az_zd(
+    azimuth_rad,
+    zenith_rad,
+    cache_dir=None,
+    max_cache_size_bytes=MAX_CACHE_SIZE_BYTES,
+):
+    """
+    Returns the rotation matrices which turn the positive z-axis into each
+    of the given pointings, e.g. a fixed set of telescope pointings.
+    See az_zd_grid() for the cache.
+
+    Parameters
+    ----------
+    azimuth_rad : array like, shape=(N,)
+        Azimuth angles of the pointings.
+    zenith_rad : array like, shape=(N,)
+        Zenith distance angles of the pointings.
+
+    Returns
+    -------
+    grid : dict of str -> array
+        Key 'rotation' with shape (N, 3, 3).
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    zenith_rad = np.asarray(zenith_rad, dtype=float)
+    assert azimuth_rad.ndim == 1
+    assert azimuth_rad.shape == zenith_rad.shape
+
+    def build():
+        rot = np.zeros(shape=(len(azimuth_rad), 3, 3))
+        for i in range(len(azimuth_rad)):
+            rot[i] = base._rotation_matrix_az_zd(
+                azimuth_rad=azimuth_rad[i], zenith_rad=zenith_rad[i]
+            )
+        return {"rotation": rot}
+
+    return _get(
+        kind="rotation_matrices_az_zd",
+        params={
+            "azimuth_rad": azimuth_rad.tolist(),
+            "zenith_rad": zenith_rad.tolist(),
+        },
+        build=build,
+        cache_dir=cache_dir,
+        max_cache_size_bytes=max_cache_size_bytes,
+    )
+
+
+def evict(cache_dir=None, max_cache_size_bytes=MAX_CACHE_SIZE_BYTES):
+    """
+    Removes the least recently used entries from the cache until it is not
+    larger than max_cache_size_bytes. Entries of other versions of this
+    package are never used again and thus removed first eventually.
+    """
+    _evict(cache_dir=cache_dir, max_cache_size_bytes=max_cache_size_bytes)
+
+
+def _evict(cache_dir, max_cache_size_bytes, keep=None):
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for key in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, key)
+        try:
+            if key.startswith(TMP_PREFIX):
+                # left behind by a builder which crashed
+                age = time.time() - os.path.getmtime(path)
+                if age > MAX_TMP_AGE_S:
+                    shutil.rmtree(path, ignore_errors=True)
+                continue
+            if key.startswith(".") or not os.path.isdir(path):
+                continue
+            if path == keep:
+                continue
+            entries.append((os.path.getmtime(path), _size(path), path))
+        except FileNotFoundError:
+            # removed by an other process in the meantime
+            continue
+
+    total = sum([size for _, size, _ in entries])
+    if keep is not None:
+        total += _size(keep)
+    for _, size, path in sorted(entries):
+        if total <= max_cache_size_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _size(path):
+    size = 0
+    for filename in os.listdir(path):
+        size += os.path.getsize(os.path.join(path, filename))
+    return size
+
+
+def _key(kind, params):
+    desc = {"kind": kind, "params": params, "version": __version__}
+    txt = json.dumps(desc, sort_keys=True)
+    return kind + "_" + hashlib.sha256(txt.encode()).hexdigest()[0:32]
+
+
+def _get(kind, params, build, cache_dir, max_cache_size_bytes):
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    path = os.path.join(cache_dir, _key(kind=kind, params=params))
+
+    # An other process's _evict() might remove the entry at any time. A
+    # vanished entry is a miss and is added again.
+    for attempt in range(MAX_NUM_ATTEMPTS):
+        try:
+            if os.path.isdir(path):
+                # mark as recently used
+                os.utime(path)
+            else:
+                _add(
+                    path=path,
+                    build=build,
+                    cache_dir=cache_dir,
+                    max_cache_size_bytes=max_cache_size_bytes,
+                )
+            return _load(path=path)
+        except FileNotFoundError:
+            continue
+
+    # The cache is thrashed, e.g. it is too small for the working set.
+    return build()
+
+
+def _add(path, build, cache_dir, max_cache_size_bytes):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=cache_dir)
+    try:
+        arrays = build()
+        for name in arrays:
+            np.save(os.path.join(tmp_path, name + ".npy"), arrays[name])
+        os.rename(tmp_path, path)
+    except OSError:
+        # An other process added the same entry in the meantime.
+        if not os.path.isdir(path):
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    _evict(
+        cache_dir=cache_dir,
+        max_cache_size_bytes=max_cache_size_bytes,
+        keep=path,
+    )
+
+
+def _load(path):
+    out = {}
+    for filename in os.listdir(path):
+        name = os.path.splitext(filename)[0]
+        out[name] = np.load(os.path.join(path, filename), mmap_mode="r")
+    return out
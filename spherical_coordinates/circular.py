@@ -0,0 +1,265 @@
+from . import base
+from . import dimensionality
+import numpy as np
+
+PI = np.pi
+TAU = 2.0 * PI
+
+
+def wrap(azimuth_rad, out=None):
+    """
+    Returns the azimuth in the range -PI < azimuth_rad <= +PI in a single
+    pass, i.e. azimuth_rad - TAU * ceil((azimuth_rad - PI) / TAU).
+    Same as azimuth_range() but for arrays only and with out.
+
+    Parameters
+    ----------
+    azimuth_rad : array like
+        Azimuth angle.
+    out : array or None
+        Array to write the result into. Can be azimuth_rad itself. A new
+        array is allocated if None.
+
+    Returns
+    -------
+    azimuth_rad : array
+        The array out if given.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    (out,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=azimuth_rad.shape
+    )
+    turns = np.subtract(azimuth_rad, PI)
+    turns /= TAU
+    np.ceil(turns, out=turns)
+    turns *= TAU
+    np.subtract(azimuth_rad, turns, out=out)
+    # rounding near the seam for large turns
+    np.copyto(out, out - TAU, where=out > PI)
+    np.copyto(out, out + TAU, where=out <= -PI)
+    return out
+
+
+def wrapped_difference(a_rad, b_rad, out=None):
+    """
+    Returns the shortest signed angle from b_rad to a_rad, i.e.
+    azimuth_range(a_rad - b_rad), in a single pass.
+
+    Parameters
+    ----------
+    a_rad : array like
+        Azimuth angle.
+    b_rad : array like
+        Azimuth angle.
+    out : array or None
+        Array to write the difference into. A new array is allocated if
+        None.
+
+    Returns
+    -------
+    difference_rad : array
+        In the range -PI < difference_rad <= +PI. The array out if given.
+    """
+    a_rad = np.asarray(a_rad, dtype=float)
+    b_rad = np.asarray(b_rad, dtype=float)
+    shape = np.broadcast_shapes(a_rad.shape, b_rad.shape)
+    (out,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=shape
+    )
+    np.subtract(a_rad, b_rad, out=out)
+    return wrap(azimuth_rad=out, out=out)
+
+
+def init_unwrap():
+    """
+    Returns the state to unwrap a stream of azimuths chunk by chunk.
+    See unwrap(). The state is a dict and can be pickled. 'last_rad' is
+    None until the first sample was seen.
+
+    Returns
+    -------
+    state : dict
+    """
+    return {"last_rad": None, "turns": 0.0}
+
+
+def unwrap(state, azimuth_rad, out=None):
+    """
+    Unwraps a chunk of a stream of azimuths so that consecutive samples
+    never jump by more than PI across the seam at +-PI. The state is
+    updated in place and carries the last sample to the next chunk. So
+    unwrapping a stream in chunks gives the same result as unwrapping it
+    at once. The first sample of the stream is wrapped with
+    azimuth_range().
+
+    The unwrapped azimuths are the azimuths plus integer multiples of TAU.
+    The integer turns are summed up exactly, so there is no drift even in
+    very long streams. A non finite sample, e.g. nan, is nan in the output
+    but does not add any turns, so the samples after it stay unwrapped.
+
+    Parameters
+    ----------
+    state : dict
+        See init_unwrap().
+    azimuth_rad : array like, shape=(N,)
+        The next chunk of the stream.
+    out : array or None
+        Array with shape (N,) to write the unwrapped azimuths into. A new
+        array is allocated if None.
+
+    Returns
+    -------
+    azimuth_rad : array, shape=(N,)
+        The array out if given.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    assert azimuth_rad.ndim == 1
+    (out,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=azimuth_rad.shape
+    )
+    num = azimuth_rad.shape[0]
+    if num == 0:
+        return out
+
+    # previous sample of each sample
+    prev = np.empty(num)
+    prev[1:] = azimuth_rad[:-1]
+    if state["last_rad"] is None:
+        first = base.azimuth_range(azimuth_rad=azimuth_rad[0])
+        prev[0] = azimuth_rad[0]
+        turns_before = np.round((first - azimuth_rad[0]) / TAU)
+        if not np.isfinite(turns_before):
+            turns_before = 0.0
+    else:
+        prev[0] = state["last_rad"]
+        turns_before = state["turns"]
+
+    # turns = round((wrapped_difference - raw_difference) / TAU)
+    raw = np.subtract(azimuth_rad, prev, out=prev)
+    turns = wrap(azimuth_rad=raw)
+    turns -= raw
+    turns /= TAU
+    np.round(turns, out=turns)
+    # differences to or from non finite samples add no turns
+    np.copyto(turns, 0.0, where=np.logical_not(np.isfinite(turns)))
+    np.cumsum(turns, out=turns)
+    turns += turns_before
+
+    state["last_rad"] = float(azimuth_rad[-1])
+    state["turns"] = float(turns[-1])
+
+    turns *= TAU
+    np.add(azimuth_rad, turns, out=out)
+    return out
+
+
+def mean(azimuth_rad, axis=None, out=None, eps=1e-12):
+    """
+    Returns the circular mean of azimuths, i.e. the direction of the mean of
+    the unit vectors (cos(azimuth), sin(azimuth)).
+
+    Parameters
+    ----------
+    azimuth_rad : array like
+        Azimuth angles.
+    axis : int or None
+        Axis along which the mean is computed. Default is all azimuths.
+    out : array or None
+        Array to write the mean into.
+    eps : float
+        The mean is not defined when the length of the mean vector is below
+        eps, e.g. for two opposite azimuths.
+
+    Returns
+    -------
+    mean_rad : float or array
+        In the range -PI < mean_rad <= +PI. Nan if not defined or if there
+        are no azimuths.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    num = azimuth_rad.size if axis is None else azimuth_rad.shape[axis]
+    sum_cos, sum_sin = _sum_cos_sin(azimuth_rad=azimuth_rad, axis=axis)
+    zero = np.hypot(sum_cos, sum_sin) < eps * num
+    zero = np.logical_or(zero, num == 0)
+    # arctan2 returns -PI for sum_sin = -0.0
+    res = np.where(zero, np.nan, np.arctan2(sum_sin, sum_cos))
+    res = base.azimuth_range(azimuth_rad=res)
+    if out is None:
+        return res
+    out[...] = res
+    return out
+
+
+def variance(azimuth_rad, axis=None, out=None):
+    """
+    Returns the circular variance of azimuths, i.e. 1 - R where R is the
+    length of the mean of the unit vectors (cos(azimuth), sin(azimuth)).
+    It is 0 when all azimuths are equal and 1 when they cancel out.
+
+    Parameters
+    ----------
+    azimuth_rad : array like
+        Azimuth angles.
+    axis : int or None
+        Axis along which the variance is computed. Default is all azimuths.
+    out : array or None
+        Array to write the variance into.
+
+    Returns
+    -------
+    variance : float or array
+        In the range [0, 1]. Nan if there are no azimuths.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    num = azimuth_rad.size if axis is None else azimuth_rad.shape[axis]
+    sum_cos, sum_sin = _sum_cos_sin(azimuth_rad=azimuth_rad, axis=axis)
+    if num == 0:
+        res = np.full(shape=np.shape(sum_cos), fill_value=np.nan)[()]
+    else:
+        res = 1.0 - np.hypot(sum_cos, sum_sin) / num
+    if out is None:
+        return res
+    out[...] = res
+    return out
+
+
+def rate_of_change(azimuth_rad, time, out=None):
+    """
+    Returns the rate of change of consecutive azimuths, i.e. the wrapped
+    difference of neighbouring samples over the difference of their times.
+    A turn across the seam at +-PI is no jump.
+
+    Parameters
+    ----------
+    azimuth_rad : array like, shape=(N,)
+        Azimuth angles.
+    time : array like, shape=(N,)
+        Times of the samples, e.g. in seconds.
+    out : array or None
+        Array with shape (N - 1,) to write the rates into. A new array is
+        allocated if None.
+
+    Returns
+    -------
+    rate : array, shape=(N - 1,)
+        In rad per unit of time. The array out if given.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    time = np.asarray(time, dtype=float)
+    assert azimuth_rad.ndim == 1
+    assert azimuth_rad.shape == time.shape
+    num = max(azimuth_rad.shape[0] - 1, 0)
+    (out,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=(num,)
+    )
+    wrapped_difference(azimuth_rad[1:], azimuth_rad[:-1], out=out)
+    out /= np.diff(time)
+    return out
+
+
+def _sum_cos_sin(azimuth_rad, axis):
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    return (
+        np.sum(np.cos(azimuth_rad), axis=axis),
+        np.sum(np.sin(azimuth_rad), axis=axis),
+    )
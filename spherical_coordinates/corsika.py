@@ -1,6 +1,9 @@
+from . import base
 from . import dimensionality
 import numpy as np
 
+SCRATCH_BLOCK_SIZE = 2**14
+
 
 def az_to_phi(azimuth_rad):
     return azimuth_rad - np.pi
@@ -51,3 +54,146 @@ def cy_to_vy(cy):
 
 def cz_to_wz(cz):
     return -cz
+
+
+def bunches_to_cx_cy_cz(bunches, ux="ux", vy="vy", out=None, eps=1e-6):
+    """
+    Returns the cartesian incident vectors (cx, cy, cz) of a table of
+    CORSIKA bunches or particles. The columns ux and vy are read as views
+    without copying and the results are written into the arrays in out.
+    The arrays in out also serve as scratch space, so no full size
+    intermediate arrays are allocated. The cz component is restored
+    assuming cz > 0, see restore_cz().
+
+    Parameters
+    ----------
+    bunches : numpy.recarray or array, shape=(N, k)
+        A structured array, or a two dimensional block of columns.
+    ux : str or int
+        Name of the field in the structured array, or index of the column
+        in the block.
+    vy : str or int
+        See ux.
+    out : tuple(array, array, array) or None
+        Arrays with shape (N,) to write cx, cy and cz into. These can be
+        views, e.g. the fields of an other structured array. New arrays are
+        allocated if None.
+    eps : float
+        See restore_cz().
+
+    Returns
+    -------
+    (cx, cy, cz) : (array, array, array)
+        The arrays in out.
+    """
+    ux = _column(table=bunches, key=ux)
+    vy = _column(table=bunches, key=vy)
+    cx, cy, cz = dimensionality._out_buffers(out=out, num=3, shape=(len(ux),))
+
+    # cy is the scratch space of cz before it is written itself
+    _restore_cz(ux=ux, vy=vy, out=cz, scratch=cy, eps=eps)
+    np.negative(ux, out=cx)
+    np.negative(vy, out=cy)
+    return cx, cy, cz
+
+
+def bunches_to_az_zd(bunches, ux="ux", vy="vy", out=None, eps=1e-6):
+    """
+    Returns the pointings (azimuth, zenith distance) of a table of CORSIKA
+    bunches or particles. See bunches_to_cx_cy_cz().
+
+    Parameters
+    ----------
+    out : tuple(array, array) or None
+        Arrays with shape (N,) to write azimuth and zenith distance into.
+
+    Returns
+    -------
+    (azimuth_rad, zenith_rad) : (array, array)
+        The arrays in out.
+    """
+    ux = _column(table=bunches, key=ux)
+    vy = _column(table=bunches, key=vy)
+    az, zd = dimensionality._out_buffers(out=out, num=2, shape=(len(ux),))
+
+    # az is the scratch space of zd before it is written itself
+    _restore_cz(ux=ux, vy=vy, out=zd, scratch=az, eps=eps)
+    np.arccos(zd, out=zd)
+
+    # The momentum's azimuth is phi = arctan2(vy, ux), see phi_to_az().
+    # So az = phi + PI within 0 < az <= 2 PI is wrapped into -PI < az <= PI.
+    np.arctan2(vy, ux, out=az)
+    az += np.pi
+    np.subtract(az, 2.0 * np.pi, out=az, where=az > np.pi)
+    return az, zd
+
+
+def bunches_angle_to_az_zd(
+    bunches, azimuth_rad, zenith_rad, ux="ux", vy="vy", out=None, eps=1e-6
+):
+    """
+    Returns the angles between the directions in a table of CORSIKA bunches
+    or particles and a pointing (azimuth, zenith distance).
+    See bunches_to_cx_cy_cz().
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth angle of pointing.
+    zenith_rad : float
+        Zenith distance angle of pointing.
+    out : array or None
+        Array with shape (N,) to write the angles into.
+
+    Returns
+    -------
+    angle_rad : array
+        The array out.
+    """
+    ux = _column(table=bunches, key=ux)
+    vy = _column(table=bunches, key=vy)
+    (angle,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=(len(ux),)
+    )
+
+    pcx, pcy, pcz = base.az_zd_to_cx_cy_cz(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+
+    # dot = cx * pcx + cy * pcy + cz * pcz, with cx = -ux and cy = -vy.
+    # The only output is the angle, so the scratch space is a small block.
+    scratch = np.empty(min(len(ux), SCRATCH_BLOCK_SIZE))
+    for start in range(0, len(ux), SCRATCH_BLOCK_SIZE):
+        stop = min(start + SCRATCH_BLOCK_SIZE, len(ux))
+        a = angle[start:stop]
+        tmp = scratch[0 : stop - start]
+        _restore_cz(
+            ux=ux[start:stop], vy=vy[start:stop], out=a, scratch=tmp, eps=eps
+        )
+        a *= pcz
+        np.multiply(ux[start:stop], pcx, out=tmp)
+        a -= tmp
+        np.multiply(vy[start:stop], pcy, out=tmp)
+        a -= tmp
+    np.clip(angle, -1.0, 1.0, out=angle)
+    np.arccos(angle, out=angle)
+    return angle
+
+
+def _column(table, key):
+    if table.dtype.names is not None:
+        return table[key]
+    else:
+        assert table.ndim == 2
+        return table[:, key]
+
+
+def _restore_cz(ux, vy, out, scratch, eps):
+    # See restore_cz(). The signs of ux and vy do not matter.
+    np.multiply(ux, ux, out=out)
+    np.multiply(vy, vy, out=scratch)
+    out += scratch
+    np.subtract(1.0, out, out=out)
+    assert eps >= 0.0
+    np.maximum(out, 0.0, out=out, where=out >= -eps)
+    np.sqrt(out, out=out)
@@ -1,16 +1,24 @@
 import numpy as np
 
 
-def _in(x):
+def _in(x, xp=None):
     """
     Allows to compute input 'x' always as if it is array like
     while the result of a computation can be returned with the same
     dimensionality as the dimensionality of the input 'x'.
     To be used in combination with _out() inside a function.
 
+    Arrays of other libraries which implement the Array API
+    (__array_namespace__) or numpy's protocols (__array_function__) are not
+    converted into numpy arrays. This way lazy or chunked arrays are not
+    materialized.
+
     Parameters
     ----------
     x : array or scalar like
+    xp : namespace or None
+        The array namespace of the computation, see _namespace(). Scalars
+        are converted into arrays of this namespace. Default is numpy.
 
     Returns
     -------
@@ -18,6 +26,22 @@ def _in(x):
         The bool 'is_scalar' is for bookkeeping. The output 'x' is array like
         and has the same content as 'x'.
     """
+    if _is_foreign_array(x):
+        is_scalar = False
+        if x.ndim == 0:
+            x = _reshape(x, (1,))
+            is_scalar = True
+        return is_scalar, x
+
+    if xp is not None and xp is not np:
+        if isinstance(x, (int, float)):
+            x = float(x)
+        x = xp.asarray(x)
+        is_scalar = False
+        if x.ndim == 0:
+            x = xp.reshape(x, (1,))
+            is_scalar = True
+        return is_scalar, x
 
     x = np.asarray(x)
     is_scalar = False
@@ -29,6 +53,87 @@ def _in(x):
 
 def _out(is_scalar, x):
     if is_scalar:
-        return np.squeeze(x).item()
+        if isinstance(x, np.ndarray):
+            return np.squeeze(x).item()
+        return _reshape(x, ())
     else:
         return x
+
+
+def _out_buffers(out, num, shape):
+    """
+    Returns the num arrays to write the results of a function into.
+    To be used for a function's parameter 'out'.
+
+    Parameters
+    ----------
+    out : tuple of arrays or None
+        The arrays given by the caller. Each must have the shape 'shape'.
+        New arrays are allocated if None.
+    num : int
+        Number of results.
+    shape : tuple of ints
+        Shape of each result.
+
+    Returns
+    -------
+    out : tuple of arrays
+    """
+    if out is None:
+        return tuple([np.empty(shape=shape) for i in range(num)])
+    assert len(out) == num
+    for o in out:
+        assert o.shape == shape
+    return tuple(out)
+
+
+def _asarray(x, xp):
+    """
+    Returns 'x' as an array of the namespace 'xp'. Python numbers become
+    floating point arrays. Foreign arrays are returned as they are.
+    """
+    if _is_foreign_array(x):
+        return x
+    if isinstance(x, (int, float)):
+        x = float(x)
+    return xp.asarray(x)
+
+
+def _namespace(*xs):
+    """
+    Returns the array namespace to compute the arrays 'xs' with.
+    This is the namespace of the first array which implements the Array API
+    and is not a numpy array. Otherwise it is numpy. Duck arrays which only
+    implement numpy's protocols (__array_function__, __array_ufunc__) are
+    computed with numpy's functions, which dispatch to them.
+    """
+    for x in xs:
+        if _is_foreign_array(x) and hasattr(x, "__array_namespace__"):
+            return x.__array_namespace__()
+    return np
+
+
+def _is_foreign_array(x):
+    if isinstance(x, (np.ndarray, np.generic)):
+        return False
+    return hasattr(x, "__array_namespace__") or hasattr(
+        x, "__array_function__"
+    )
+
+
+def _reshape(x, shape):
+    if hasattr(x, "__array_namespace__"):
+        return x.__array_namespace__().reshape(x, shape)
+    return np.reshape(x, shape)
+
+
+def _acos(xp, x):
+    if xp is np:
+        return np.arccos(x)
+    return xp.acos(x)
+
+
+def _atan2(xp, y, x):
+    if xp is np:
+        return np.arctan2(y, x)
+    return xp.atan2(y, x)
@@ -0,0 +1,270 @@
+from . import corsika
+from . import dimensionality
+import numpy as np
+
+
+def az_zd_to_cx_cy_cz(azimuth_rad, zenith_rad, out=None):
+    """
+    Returns the Jacobians of az_zd_to_cx_cy_cz(), i.e. the derivatives of
+    (cx, cy, cz) with respect to (azimuth, zenith distance).
+
+        | d cx / d az   d cx / d zd |
+        | d cy / d az   d cy / d zd |
+        | d cz / d az   d cz / d zd |
+
+    At the zenith the column of the azimuth is zero.
+
+    Parameters
+    ----------
+    azimuth_rad : float or array like
+        Azimuth angle of incident.
+    zenith_rad : float or array like
+        Zenith distance angle of incident.
+    out : array or None
+        Array with shape (..., 3, 2) to write the Jacobians into. A new array
+        is allocated if None.
+
+    Returns
+    -------
+    jacobian : array, shape=(..., 3, 2)
+        A stack of matrices, one for each pointing. The array out if given.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=float)
+    zenith_rad = np.asarray(zenith_rad, dtype=float)
+    shape = np.broadcast_shapes(azimuth_rad.shape, zenith_rad.shape)
+    (jac,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=shape + (3, 2)
+    )
+
+    cos_az = np.cos(azimuth_rad)
+    sin_az = np.sin(azimuth_rad)
+    cos_zd = np.cos(zenith_rad)
+    sin_zd = np.sin(zenith_rad)
+
+    np.multiply(sin_zd, sin_az, out=jac[..., 0, 0])
+    np.negative(jac[..., 0, 0], out=jac[..., 0, 0])
+    np.multiply(cos_zd, cos_az, out=jac[..., 0, 1])
+    np.multiply(sin_zd, cos_az, out=jac[..., 1, 0])
+    np.multiply(cos_zd, sin_az, out=jac[..., 1, 1])
+    jac[..., 2, 0] = 0.0
+    np.negative(sin_zd, out=jac[..., 2, 1])
+    return jac
+
+
+def cx_cy_cz_to_az_zd(cx, cy, cz, out=None, eps=1e-12):
+    """
+    Returns the Jacobians of cx_cy_cz_to_az_zd(), i.e. the derivatives of
+    (azimuth, zenith distance) with respect to (cx, cy, cz).
+
+        | d az / d cx   d az / d cy   d az / d cz |
+        | d zd / d cx   d zd / d cy   d zd / d cz |
+
+    The azimuth is not defined in the zenith (and nadir) and the zenith
+    distance is not differentiable there. Where cx**2 + cy**2 < eps, all
+    elements of the Jacobian are nan so that transformed covariances are
+    nan as well instead of being silently wrong.
+
+    Parameters
+    ----------
+    cx : float or array like
+        X component of cartesian incident direction vector.
+    cy : float or array like
+        Y component of cartesian incident direction vector.
+    cz : float or array like
+        Z component of cartesian incident direction vector.
+    out : array or None
+        Array with shape (..., 2, 3) to write the Jacobians into. A new array
+        is allocated if None.
+    eps : float
+        Radius squared of the singular region around the zenith and nadir.
+
+    Returns
+    -------
+    jacobian : array, shape=(..., 2, 3)
+        A stack of matrices, one for each direction. The array out if given.
+    """
+    assert eps >= 0.0
+    cx = np.asarray(cx, dtype=float)
+    cy = np.asarray(cy, dtype=float)
+    cz = np.asarray(cz, dtype=float)
+    shape = np.broadcast_shapes(cx.shape, cy.shape, cz.shape)
+    (jac,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=shape + (2, 3)
+    )
+
+    # az = atan2(cy, cx)
+    # r2 has the broadcast shape, so mixed scalars and arrays add up
+    r2 = np.empty(shape=shape)
+    np.multiply(cx, cx, out=r2)
+    np.add(r2, np.multiply(cy, cy), out=r2)
+    singular = r2 < eps
+    np.copyto(r2, np.nan, where=singular)
+    np.divide(-cy, r2, out=jac[..., 0, 0])
+    np.divide(cx, r2, out=jac[..., 0, 1])
+    jac[..., 0, 2] = 0.0
+
+    # zd = arccos(cz)
+    jac[..., 1, 0] = 0.0
+    jac[..., 1, 1] = 0.0
+    sin_zd = np.empty(shape=shape)
+    np.multiply(cz, cz, out=sin_zd)
+    np.subtract(1.0, sin_zd, out=sin_zd)
+    np.copyto(sin_zd, np.nan, where=sin_zd <= 0.0)
+    np.sqrt(sin_zd, out=sin_zd)
+    np.divide(-1.0, sin_zd, out=jac[..., 1, 2])
+
+    singular = np.broadcast_to(
+        singular[..., np.newaxis, np.newaxis], jac.shape
+    )
+    np.copyto(jac, np.nan, where=singular)
+    return jac
+
+
+def phi_theta_to_ux_vy_wz(phi_rad, theta_rad, out=None):
+    """
+    Returns the Jacobians of the CORSIKA momentum (ux, vy, wz) with respect
+    to the CORSIKA angles (phi, theta). The momentum is the negative of the
+    incident direction and phi is the azimuth shifted by PI, see corsika.
+    So this is the negative of az_zd_to_cx_cy_cz().
+
+    Parameters
+    ----------
+    phi_rad : float or array like
+        CORSIKA's phi angle.
+    theta_rad : float or array like
+        CORSIKA's theta angle.
+    out : array or None
+        Array with shape (..., 3, 2). A new array is allocated if None.
+
+    Returns
+    -------
+    jacobian : array, shape=(..., 3, 2)
+    """
+    jac = az_zd_to_cx_cy_cz(
+        azimuth_rad=corsika.phi_to_az(np.asarray(phi_rad, dtype=float)),
+        zenith_rad=corsika.theta_to_zd(theta_rad),
+        out=out,
+    )
+    np.negative(jac, out=jac)
+    return jac
+
+
+def ux_vy_wz_to_phi_theta(ux, vy, wz, out=None, eps=1e-12):
+    """
+    Returns the Jacobians of the CORSIKA angles (phi, theta) with respect to
+    the CORSIKA momentum (ux, vy, wz). This is the negative of
+    cx_cy_cz_to_az_zd() evaluated at the incident direction, including its
+    handling of the zenith.
+
+    Parameters
+    ----------
+    ux : float or array like
+        X component of CORSIKA's momentum.
+    vy : float or array like
+        Y component of CORSIKA's momentum.
+    wz : float or array like
+        Z component of CORSIKA's momentum.
+    out : array or None
+        Array with shape (..., 2, 3). A new array is allocated if None.
+    eps : float
+        See cx_cy_cz_to_az_zd().
+
+    Returns
+    -------
+    jacobian : array, shape=(..., 2, 3)
+    """
+    jac = cx_cy_cz_to_az_zd(
+        cx=corsika.ux_to_cx(np.asarray(ux, dtype=float)),
+        cy=corsika.vy_to_cy(np.asarray(vy, dtype=float)),
+        cz=corsika.wz_to_cz(np.asarray(wz, dtype=float)),
+        out=out,
+        eps=eps,
+    )
+    np.negative(jac, out=jac)
+    return jac
+
+
+def transform_covariance(jacobian, covariance, out=None):
+    """
+    Propagates covariances to first order, i.e. J C J^T, for a whole stack
+    of Jacobians J and covariances C at once.
+
+    Parameters
+    ----------
+    jacobian : array, shape=(..., M, N)
+        E.g. from az_zd_to_cx_cy_cz() or cx_cy_cz_to_az_zd().
+    covariance : array, shape=(..., N, N)
+        The covariances in the input representation. A single matrix with
+        shape (N, N) is used for all Jacobians.
+    out : array or None
+        Array with shape (..., M, M). A new array is allocated if None.
+
+    Returns
+    -------
+    covariance : array, shape=(..., M, M)
+        The covariances in the output representation. Where the Jacobian
+        is nan, e.g. in the zenith, the covariance is nan.
+    """
+    jacobian = np.asarray(jacobian, dtype=float)
+    covariance = np.asarray(covariance, dtype=float)
+    assert jacobian.ndim >= 2
+    assert covariance.ndim >= 2
+    m, n = jacobian.shape[-2:]
+    assert covariance.shape[-2:] == (n, n)
+
+    jc = np.einsum("...ij,...jk->...ik", jacobian, covariance)
+    shape = np.broadcast_shapes(jc.shape[:-2], jacobian.shape[:-2])
+    (out,) = dimensionality._out_buffers(
+        out=None if out is None else (out,), num=1, shape=shape + (m, m)
+    )
+    np.einsum("...ik,...lk->...il", jc, jacobian, out=out)
+    return out
+
+
+def covariance_az_zd_to_cx_cy_cz(azimuth_rad, zenith_rad, covariance):
+    """
+    Returns the covariances of (cx, cy, cz) for the covariances of
+    (azimuth, zenith distance). See transform_covariance().
+
+    Parameters
+    ----------
+    azimuth_rad : float or array like
+        Azimuth angle of incident.
+    zenith_rad : float or array like
+        Zenith distance angle of incident.
+    covariance : array, shape=(..., 2, 2)
+        Covariances of (azimuth, zenith distance).
+
+    Returns
+    -------
+    covariance : array, shape=(..., 3, 3)
+    """
+    jac = az_zd_to_cx_cy_cz(azimuth_rad=azimuth_rad, zenith_rad=zenith_rad)
+    return transform_covariance(jacobian=jac, covariance=covariance)
+
+
+def covariance_cx_cy_cz_to_az_zd(cx, cy, cz, covariance, eps=1e-12):
+    """
+    Returns the covariances of (azimuth, zenith distance) for the
+    covariances of (cx, cy, cz). See transform_covariance(). Near the
+    zenith the result is nan, see cx_cy_cz_to_az_zd().
+
+    Parameters
+    ----------
+    cx : float or array like
+        X component of cartesian incident direction vector.
+    cy : float or array like
+        Y component of cartesian incident direction vector.
+    cz : float or array like
+        Z component of cartesian incident direction vector.
+    covariance : array, shape=(..., 3, 3)
+        Covariances of (cx, cy, cz).
+    eps : float
+        See cx_cy_cz_to_az_zd().
+
+    Returns
+    -------
+    covariance : array, shape=(..., 2, 2)
+    """
+    jac = cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz, eps=eps)
+    return transform_covariance(jacobian=jac, covariance=covariance)
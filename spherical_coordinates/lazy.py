@@ -0,0 +1,205 @@
+from . import base
+from . import corsika
+import numpy as np
+
+NODE_KINDS = ("variable", "call", "item")
+
+
+def variable(name):
+    """
+    Returns a node of an expression graph which stands for the input array
+    with the given name. See evaluate().
+
+    Parameters
+    ----------
+    name : str
+        The name of the input.
+
+    Returns
+    -------
+    node : dict
+    """
+    return {"kind": "variable", "name": name}
+
+
+def call(func, *args, num_outputs=1, **kwargs):
+    """
+    Returns the node(s) of an expression graph which stand for calling func.
+    Nothing is computed until evaluate() is called. Known round trips are
+    removed while the graph is built, e.g. cx_cy_cz_to_az_zd() of
+    az_zd_to_cx_cy_cz() becomes azimuth_range() of the azimuth and the
+    zenith distance itself. This assumes that zenith distances are within
+    [0, PI] and that cartesian vectors have length 1.0.
+
+    Parameters
+    ----------
+    func : function
+        A function of this package or numpy, e.g. az_zd_to_cx_cy_cz or
+        numpy.less, which works element wise on arrays.
+    *args : nodes or constants
+        Positional arguments of func.
+    num_outputs : int
+        The number of arrays func returns.
+    **kwargs : constants
+        Further keyword arguments of func which are passed as is.
+
+    Returns
+    -------
+    node(s) : dict or tuple of dicts
+        A single node when num_outputs is 1.
+    """
+    simpler = _simplify(func=func, args=args, kwargs=kwargs)
+    if simpler is not None:
+        assert len(simpler) == num_outputs
+        return simpler[0] if num_outputs == 1 else simpler
+
+    node = {
+        "kind": "call",
+        "func": func,
+        "args": args,
+        "kwargs": kwargs,
+        "num_outputs": num_outputs,
+    }
+    if num_outputs == 1:
+        return node
+    return tuple(
+        [
+            {"kind": "item", "node": node, "index": i}
+            for i in range(num_outputs)
+        ]
+    )
+
+
+def evaluate(outputs, inputs, chunk_size=2**14):
+    """
+    Evaluates the expression graph of the outputs in chunks. Within a chunk
+    every node is evaluated once and its result is reused. The intermediate
+    results of a chunk are small enough to stay in the CPU's cache and only
+    the outputs are allocated in full size.
+
+    Parameters
+    ----------
+    outputs : node or list of nodes
+        The nodes to be evaluated.
+    inputs : dict of str -> array, shape=(N,)
+        The arrays of the variables.
+    chunk_size : int
+        Number of elements per chunk.
+
+    Returns
+    -------
+    results : array or list of arrays, shape=(N,)
+        A single array when outputs is a single node.
+    """
+    is_single = _is_node(outputs)
+    if is_single:
+        outputs = [outputs]
+    assert chunk_size >= 1
+
+    inputs = {key: np.asarray(inputs[key]) for key in inputs}
+    sizes = [inputs[key].shape for key in inputs]
+    assert len(sizes) > 0
+    assert all([len(s) == 1 and s == sizes[0] for s in sizes])
+    size = sizes[0][0]
+
+    results = [None for o in outputs]
+    for start in range(0, max(size, 1), chunk_size):
+        stop = min(start + chunk_size, size)
+        chunk = {key: inputs[key][start:stop] for key in inputs}
+        memo = {}
+        for i, output in enumerate(outputs):
+            res = _evaluate_node(node=output, chunk=chunk, memo=memo)
+            res = np.broadcast_to(res, (stop - start,))
+            if results[i] is None:
+                results[i] = np.empty(size, dtype=res.dtype)
+            results[i][start:stop] = res
+
+    return results[0] if is_single else results
+
+
+def _is_node(x):
+    return isinstance(x, dict) and x.get("kind") in NODE_KINDS
+
+
+def _evaluate_node(node, chunk, memo):
+    if not _is_node(node):
+        return node
+    key = id(node)
+    if key in memo:
+        return memo[key]
+
+    if node["kind"] == "variable":
+        res = chunk[node["name"]]
+    elif node["kind"] == "item":
+        res = _evaluate_node(node=node["node"], chunk=chunk, memo=memo)
+        res = res[node["index"]]
+    else:
+        args = [
+            _evaluate_node(a, chunk=chunk, memo=memo) for a in node["args"]
+        ]
+        res = node["func"](*args, **node["kwargs"])
+
+    memo[key] = res
+    return res
+
+
+_INVERSE_PAIRS = [
+    (corsika.ux_to_cx, corsika.cx_to_ux),
+    (corsika.vy_to_cy, corsika.cy_to_vy),
+    (corsika.wz_to_cz, corsika.cz_to_wz),
+    (corsika.az_to_phi, corsika.phi_to_az),
+    (corsika.zd_to_theta, corsika.theta_to_zd),
+]
+
+
+def _is_inverse(f, g):
+    for a, b in _INVERSE_PAIRS:
+        if (f is a and g is b) or (f is b and g is a):
+            return True
+    return False
+
+
+def _items_of_same_call(args):
+    """
+    Returns the call node when args are exactly its outputs in order.
+    """
+    if len(args) == 0:
+        return None
+    if not all([_is_node(a) and a["kind"] == "item" for a in args]):
+        return None
+    node = args[0]["node"]
+    if node["num_outputs"] != len(args):
+        return None
+    for i, a in enumerate(args):
+        if a["node"] is not node or a["index"] != i:
+            return None
+    return node
+
+
+def _simplify(func, args, kwargs):
+    if len(kwargs) > 0:
+        return None
+
+    if len(args) == 1 and _is_node(args[0]) and args[0]["kind"] == "call":
+        inner = args[0]
+        if len(inner["args"]) == 1 and len(inner["kwargs"]) == 0:
+            if _is_inverse(func, inner["func"]):
+                return (inner["args"][0],)
+            if func is base.azimuth_range and inner["func"] is func:
+                return (inner,)
+
+    inner = _items_of_same_call(args)
+    if inner is None or len(inner["kwargs"]) > 0:
+        return None
+    if (
+        func is base.az_zd_to_cx_cy_cz
+        and inner["func"] is base.cx_cy_cz_to_az_zd
+    ):
+        return tuple(inner["args"])
+    if (
+        func is base.cx_cy_cz_to_az_zd
+        and inner["func"] is base.az_zd_to_cx_cy_cz
+    ):
+        az, zd = inner["args"]
+        return (call(base.azimuth_range, az), zd)
+    return None
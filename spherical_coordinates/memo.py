@@ -0,0 +1,153 @@
+from . import base
+import numpy as np
+import collections
+import functools
+import hashlib
+import inspect
+import threading
+
+
+def memoize(func, maxsize=1024, max_array_size=4096):
+    """
+    Returns func wrapped in a least recently used (LRU) cache. The cache is
+    keyed by the exact values of scalar arguments and by the content hash
+    of array arguments. The arguments are bound to the signature of func
+    first, so positional and keyword arguments, and omitted defaults, give
+    the same key. Arrays returned from the cache are read only so that
+    callers can not corrupt the cache.
+
+    The wrapper has the functions:
+        cache_info() returns a dict with 'hits', 'misses', 'size', and
+            'maxsize'.
+        cache_clear() removes all entries and resets the statistics.
+        cache_invalidate(*args, **kwargs) removes the entry of the
+            arguments.
+
+    Parameters
+    ----------
+    func : function
+        A function without side effects, e.g. az_zd_to_cx_cy_cz.
+    maxsize : int
+        Maximum number of entries.
+    max_array_size : int
+        Arrays with more elements are not hashed and the call bypasses the
+        cache. Hashing large arrays costs about as much as the transform.
+
+    Returns
+    -------
+    wrapper : function
+    """
+    assert maxsize > 0
+    assert max_array_size >= 0
+    cache = collections.OrderedDict()
+    stats = {"hits": 0, "misses": 0}
+    lock = threading.Lock()
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        signature = None
+
+    def make_key(args, kwargs):
+        if signature is not None:
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                # let func raise its own error
+                return None
+            bound.apply_defaults()
+            args = bound.args
+            kwargs = bound.kwargs
+        try:
+            k_args = tuple(
+                [_key_of(a, max_array_size=max_array_size) for a in args]
+            )
+            k_kwargs = tuple(
+                [
+                    (name, _key_of(kwargs[name], max_array_size))
+                    for name in sorted(kwargs)
+                ]
+            )
+        except _NotCacheable:
+            return None
+        return (k_args, k_kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(args=args, kwargs=kwargs)
+        if key is not None:
+            with lock:
+                if key in cache:
+                    stats["hits"] += 1
+                    cache.move_to_end(key)
+                    return cache[key]
+        with lock:
+            stats["misses"] += 1
+
+        result = func(*args, **kwargs)
+
+        if key is not None:
+            result = _read_only(result)
+            with lock:
+                cache[key] = result
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+        return result
+
+    def cache_info():
+        with lock:
+            return {
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                "size": len(cache),
+                "maxsize": maxsize,
+            }
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+            stats["hits"] = 0
+            stats["misses"] = 0
+
+    def cache_invalidate(*args, **kwargs):
+        key = make_key(args=args, kwargs=kwargs)
+        with lock:
+            cache.pop(key, None)
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_invalidate = cache_invalidate
+    return wrapper
+
+
+class _NotCacheable(Exception):
+    pass
+
+
+def _key_of(x, max_array_size):
+    if isinstance(x, (bool, int, str)) or x is None:
+        return (type(x).__name__, x)
+    if isinstance(x, float):
+        # exact, and nan equals nan
+        return ("float", x.hex())
+    x = np.asarray(x)
+    if x.dtype.hasobject or x.size > max_array_size:
+        raise _NotCacheable()
+    if x.ndim == 0 and x.dtype.kind == "f":
+        return ("float", float(x).hex())
+    digest = hashlib.sha1(x.tobytes()).hexdigest()
+    return ("array", x.dtype.str, x.shape, digest)
+
+
+def _read_only(result):
+    if isinstance(result, tuple):
+        return tuple([_read_only(r) for r in result])
+    if isinstance(result, np.ndarray):
+        result = np.array(result)
+        result.setflags(write=False)
+    return result
+
+
+az_zd_to_cx_cy_cz = memoize(base.az_zd_to_cx_cy_cz)
+cx_cy_cz_to_az_zd = memoize(base.cx_cy_cz_to_az_zd)
+rotation_matrix_az_zd = memoize(base._rotation_matrix_az_zd)
@@ -0,0 +1,175 @@
+from . import base
+import numpy as np
+
+# The largest error occurs in the centers of the octahedron's faces where
+# it is about 2.1 times the quantization step 2 / (2**bits_per_axis - 1).
+MAX_ANGLE_ERROR_RAD = {
+    16: 6.6e-5,
+    24: 2.6e-7,
+    32: 1.1e-9,
+}
+
+
+def _dtype(bits_per_axis):
+    assert bits_per_axis in MAX_ANGLE_ERROR_RAD
+    return np.uint32 if bits_per_axis <= 16 else np.uint64
+
+
+def cx_cy_cz_to_code(cx, cy, cz, bits_per_axis=16, out=None):
+    """
+    Encodes cartesian direction vectors (cx, cy, cz) into integers using
+    the octahedral mapping. The unit sphere is projected onto an octahedron
+    which is unfolded into a square. Both coordinates in the square are
+    quantized with bits_per_axis bits each.
+
+    bits_per_axis  dtype   bytes  max. angle error
+    -------------  ------  -----  ----------------
+              16   uint32      4       6.6e-5 rad
+              24   uint64      8       2.6e-7 rad
+              32   uint64      8       1.1e-9 rad
+
+    See MAX_ANGLE_ERROR_RAD. Compared to three float64 (24 bytes) this is
+    6 or 3 times smaller. Encoding and decoding are element wise, so large
+    arrays, e.g. numpy.memmap, can be processed chunk by chunk using 'out'.
+
+    Parameters
+    ----------
+    cx : array like
+        X component of cartesian direction vectors with length 1.0.
+    cy : array like
+        Y component.
+    cz : array like
+        Z component.
+    bits_per_axis : int
+        One of 16, 24, or 32.
+    out : array or None
+        Array of dtype uint32 (16 bits) or uint64 (24, 32 bits) to write the
+        codes into. A new array is allocated if None.
+
+    Returns
+    -------
+    code : array
+        The array out if given.
+
+    See also the inverse: code_to_cx_cy_cz()
+    """
+    dtype = _dtype(bits_per_axis)
+    cx = np.asarray(cx, dtype=float)
+    cy = np.asarray(cy, dtype=float)
+    cz = np.asarray(cz, dtype=float)
+    if out is None:
+        out = np.empty(shape=cx.shape, dtype=dtype)
+    assert out.dtype == dtype
+
+    norm = np.abs(cx) + np.abs(cy)
+    norm += np.abs(cz)
+    px = cx / norm
+    py = cy / norm
+
+    lower = cz < 0.0
+    fx = _sign_not_zero(px)
+    fx *= 1.0 - np.abs(py)
+    fy = _sign_not_zero(py)
+    fy *= 1.0 - np.abs(px)
+    np.copyto(px, fx, where=lower)
+    np.copyto(py, fy, where=lower)
+
+    qx = _quantize(p=px, bits_per_axis=bits_per_axis)
+    qy = _quantize(p=py, bits_per_axis=bits_per_axis)
+    np.left_shift(qx, dtype(bits_per_axis), out=qx)
+    np.bitwise_or(qx, qy, out=out)
+    return out
+
+
+def code_to_cx_cy_cz(code, bits_per_axis=16, out=None):
+    """
+    Decodes integers into cartesian direction vectors (cx, cy, cz).
+
+    Parameters
+    ----------
+    code : array like
+        See cx_cy_cz_to_code().
+    bits_per_axis : int
+        Must match the encoding.
+    out : tuple(array, array, array) or None
+        Arrays to write cx, cy, and cz into. New arrays are allocated if
+        None.
+
+    Returns
+    -------
+    (cx, cy, cz) : (array, array, array)
+        A cartesian vector with length 1.0. The arrays in out if given.
+    """
+    dtype = _dtype(bits_per_axis)
+    code = np.asarray(code, dtype=dtype)
+    if out is None:
+        out = tuple([np.empty(shape=code.shape) for i in range(3)])
+    cx, cy, cz = out
+
+    shift = dtype(bits_per_axis)
+    mask = dtype((1 << bits_per_axis) - 1)
+    _dequantize(q=code >> shift, bits_per_axis=bits_per_axis, out=cx)
+    _dequantize(q=code & mask, bits_per_axis=bits_per_axis, out=cy)
+
+    np.abs(cx, out=cz)
+    np.subtract(1.0, cz, out=cz)
+    cz -= np.abs(cy)
+
+    lower = cz < 0.0
+    fx = _sign_not_zero(cx)
+    fx *= 1.0 - np.abs(cy)
+    fy = _sign_not_zero(cy)
+    fy *= 1.0 - np.abs(cx)
+    np.copyto(cx, fx, where=lower)
+    np.copyto(cy, fy, where=lower)
+
+    norm = np.multiply(cx, cx)
+    norm += cy * cy
+    norm += cz * cz
+    np.sqrt(norm, out=norm)
+    cx /= norm
+    cy /= norm
+    cz /= norm
+    return cx, cy, cz
+
+
+def az_zd_to_code(azimuth_rad, zenith_rad, bits_per_axis=16, out=None):
+    """
+    Encodes pointings (azimuth, zenith distance) into integers.
+    See cx_cy_cz_to_code().
+    """
+    cx, cy, cz = base.az_zd_to_cx_cy_cz(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+    return cx_cy_cz_to_code(
+        cx=cx, cy=cy, cz=cz, bits_per_axis=bits_per_axis, out=out
+    )
+
+
+def code_to_az_zd(code, bits_per_axis=16):
+    """
+    Decodes integers into pointings (azimuth, zenith distance).
+    See code_to_cx_cy_cz().
+    """
+    cx, cy, cz = code_to_cx_cy_cz(code=code, bits_per_axis=bits_per_axis)
+    return base.cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz)
+
+
+def _sign_not_zero(x):
+    return np.where(x >= 0.0, 1.0, -1.0)
+
+
+def _quantize(p, bits_per_axis):
+    dtype = _dtype(bits_per_axis)
+    scale = float((1 << bits_per_axis) - 1)
+    q = p + 1.0
+    q *= 0.5 * scale
+    np.rint(q, out=q)
+    np.clip(q, 0.0, scale, out=q)
+    return q.astype(dtype)
+
+
+def _dequantize(q, bits_per_axis, out):
+    scale = float((1 << bits_per_axis) - 1)
+    np.multiply(q, 2.0 / scale, out=out)
+    out -= 1.0
@@ -0,0 +1,471 @@
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+import os
+import numpy as np
+
+
+def apply(
+    func,
+    arrays,
+    kwargs=None,
+    num_outputs=1,
+    num_processes=None,
+    chunk_size=2**20,
+    start_method=None,
+    output_dtypes=None,
+    out=None,
+):
+    """
+    Applies func to the arrays in a pool of processes. The arrays are
+    copied once into blocks of shared memory. Each process runs func on
+    views into a range of these blocks (without copying) and writes its
+    results into blocks of shared memory for the outputs. The blocks are
+    unlinked when done or when an error occurs. The outputs are copied out
+    of the shared memory before, so next to the copy of the inputs there
+    is one more copy of the outputs at the end.
+
+    Each call starts and stops its own pool. To reuse a pool and to keep
+    in- and outputs in shared memory without copying, see Executor.
+
+    Parameters
+    ----------
+    func : function
+        E.g. spherical_coordinates.az_zd_to_cx_cy_cz. Must be picklable, i.e.
+        be defined on the top level of a module.
+    arrays : dict of str -> array like, shape=(N,)
+        The keyword arguments of func which are arrays.
+    kwargs : dict or None
+        Further keyword arguments of func which are passed as is.
+    num_outputs : int
+        The number of arrays func returns.
+    num_processes : int or None
+        Number of processes in the pool. Default is os.cpu_count().
+    chunk_size : int
+        Length of the ranges dispatched to the processes.
+    start_method : str or None
+        See multiprocessing.get_context().
+    output_dtypes : list of dtypes or None
+        The dtypes of the outputs. Default is float64 for all outputs, or
+        the dtypes of out if given. The results of func are cast into these
+        and the cast must be safe, e.g. use [bool] for is_az_zd_in_box.
+    out : array, tuple of arrays, or None
+        Arrays with shape (N,) to write the outputs into. A single array
+        when num_outputs is 1. New arrays are allocated if None.
+
+    Returns
+    -------
+    outputs : array or tuple of arrays, shape=(N,)
+        A single array when num_outputs is 1. The arrays in out if given.
+    """
+    with Executor(
+        num_processes=num_processes, start_method=start_method
+    ) as executor:
+        return executor.apply(
+            func=func,
+            arrays=arrays,
+            kwargs=kwargs,
+            num_outputs=num_outputs,
+            chunk_size=chunk_size,
+            output_dtypes=output_dtypes,
+            out=out,
+        )
+
+
+def sample(
+    func,
+    size,
+    seed,
+    kwargs=None,
+    num_outputs=2,
+    num_processes=None,
+    chunk_size=2**20,
+    start_method=None,
+    output_dtypes=None,
+    out=None,
+):
+    """
+    Draws size samples from func in a pool of processes. Just like apply()
+    but func is called with the arguments 'prng' and 'size' for each range.
+    E.g. func is spherical_coordinates.random.uniform_az_zd_in_cone.
+
+    Each range has its own prng spawned from a numpy.random.SeedSequence of
+    the seed. The samples depend on the seed and the chunk_size but not on
+    the number of processes.
+
+    Parameters
+    ----------
+    func : function
+        Must accept the arguments 'prng' and 'size'.
+    size : int
+        The size (number) of samples.
+    seed : int
+        Seed for the numpy.random.SeedSequence.
+    kwargs : dict or None
+        Further keyword arguments of func.
+    num_outputs : int
+        The number of arrays func returns.
+
+    See apply() for the remaining parameters and the returns.
+    """
+    with Executor(
+        num_processes=num_processes, start_method=start_method
+    ) as executor:
+        return executor.sample(
+            func=func,
+            size=size,
+            seed=seed,
+            kwargs=kwargs,
+            num_outputs=num_outputs,
+            chunk_size=chunk_size,
+            output_dtypes=output_dtypes,
+            out=out,
+        )
+
+
+class Executor:
+    """
+    A pool of processes which is reused for many calls of apply() and
+    sample(). Use it as a context manager. On exit, the pool is stopped and
+    the blocks of shared memory allocated with empty() are unlinked.
+
+    Arrays allocated with empty() (or contiguous slices of them) live in
+    shared memory. As inputs, the processes read them without a copy. As
+    out, the processes write into them directly, so the outputs are not
+    copied either. Other arrays are copied into and out of temporary blocks
+    of shared memory just like in apply().
+
+        with Executor(num_processes=4) as executor:
+            az = executor.empty(size=N)
+            zd = executor.empty(size=N)
+            executor.sample(func=..., size=N, seed=1, out=(az, zd))
+            cx = executor.empty(size=N)
+            ...
+
+    Parameters
+    ----------
+    num_processes : int or None
+        Number of processes in the pool. Default is os.cpu_count().
+    start_method : str or None
+        See multiprocessing.get_context().
+    """
+
+    def __init__(self, num_processes=None, start_method=None):
+        if os.name == "posix":
+            # The processes must share the resource tracker of this process
+            # which tracks the shared memory. Otherwise each process starts
+            # its own one and warns about leaks on exit.
+            resource_tracker.ensure_running()
+        ctx = multiprocessing.get_context(start_method)
+        self._pool = ctx.Pool(processes=num_processes)
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(terminate=exc_type is not None)
+
+    def close(self, terminate=False):
+        """
+        Stops the pool and unlinks the shared memory allocated with
+        empty(). Arrays from empty() must not be used anymore afterwards.
+
+        Parameters
+        ----------
+        terminate : bool
+            If True, the processes are stopped right away instead of
+            finishing their tasks.
+        """
+        if self._pool is None:
+            return
+        if terminate:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+        self._pool = None
+        for shared in self._blocks:
+            _close_block(shared["block"])
+            shared["block"].unlink()
+        self._blocks = []
+
+    def empty(self, size, dtype=float):
+        """
+        Returns a new array in shared memory. The memory is owned by the
+        executor and unlinked by close().
+
+        Parameters
+        ----------
+        size : int
+            The length of the array.
+        dtype : dtype
+            Default is float64.
+
+        Returns
+        -------
+        array : array, shape=(size,)
+            Uninitialized.
+        """
+        assert self._pool is not None, "Executor is closed."
+        assert size >= 0
+        dtype = np.dtype(dtype)
+        block = _create_block(nbytes=size * dtype.itemsize)
+        view = _view_block(block=block, dtype=dtype, size=size)
+        self._blocks.append(
+            {
+                "block": block,
+                "address": _address(block=block),
+                "nbytes": size * dtype.itemsize,
+            }
+        )
+        return view
+
+    def apply(
+        self,
+        func,
+        arrays,
+        kwargs=None,
+        num_outputs=1,
+        chunk_size=2**20,
+        output_dtypes=None,
+        out=None,
+    ):
+        """
+        Same as the function apply() but in the pool of the executor.
+        """
+        arrays = {key: np.asarray(arrays[key]) for key in arrays}
+        sizes = [arrays[key].shape for key in arrays]
+        assert len(sizes) > 0
+        assert all([len(s) == 1 and s == sizes[0] for s in sizes])
+        return self._run(
+            func=func,
+            size=sizes[0][0],
+            arrays=arrays,
+            kwargs=kwargs,
+            num_outputs=num_outputs,
+            chunk_size=chunk_size,
+            output_dtypes=output_dtypes,
+            out=out,
+            seed=None,
+        )
+
+    def sample(
+        self,
+        func,
+        size,
+        seed,
+        kwargs=None,
+        num_outputs=2,
+        chunk_size=2**20,
+        output_dtypes=None,
+        out=None,
+    ):
+        """
+        Same as the function sample() but in the pool of the executor.
+        """
+        assert size >= 0
+        return self._run(
+            func=func,
+            size=size,
+            arrays={},
+            kwargs=kwargs,
+            num_outputs=num_outputs,
+            chunk_size=chunk_size,
+            output_dtypes=output_dtypes,
+            out=out,
+            seed=seed,
+        )
+
+    def _run(
+        self,
+        func,
+        size,
+        arrays,
+        kwargs,
+        num_outputs,
+        chunk_size,
+        output_dtypes,
+        out,
+        seed,
+    ):
+        assert self._pool is not None, "Executor is closed."
+        assert num_outputs >= 1
+        assert chunk_size >= 1
+        kwargs = {} if kwargs is None else dict(kwargs)
+        if out is not None:
+            out = (out,) if num_outputs == 1 else tuple(out)
+            assert len(out) == num_outputs
+        if output_dtypes is None:
+            if out is None:
+                output_dtypes = [float for i in range(num_outputs)]
+            else:
+                output_dtypes = [o.dtype for o in out]
+        output_dtypes = [np.dtype(dtype) for dtype in output_dtypes]
+        assert len(output_dtypes) == num_outputs
+
+        temporary_blocks = []
+        try:
+            inputs = {}
+            for key in arrays:
+                arr = arrays[key]
+                inputs[key] = self._find_block(x=arr)
+                if inputs[key] is None:
+                    block = _create_block(nbytes=arr.nbytes)
+                    temporary_blocks.append(block)
+                    _write_block(
+                        block=block, dtype=arr.dtype, size=size, x=arr
+                    )
+                    inputs[key] = (block.name, arr.dtype.str, 0)
+
+            outputs = []
+            copy_outputs = []
+            for i, dtype in enumerate(output_dtypes):
+                if out is None:
+                    ref = None
+                else:
+                    assert out[i].shape == (size,)
+                    assert out[i].dtype == dtype
+                    ref = self._find_block(x=out[i])
+                if ref is None:
+                    block = _create_block(nbytes=size * dtype.itemsize)
+                    temporary_blocks.append(block)
+                    ref = (block.name, dtype.str, 0)
+                    copy_outputs.append((i, block))
+                outputs.append(ref)
+
+            starts = np.arange(0, size, chunk_size)
+            if seed is None:
+                seeds = [None for start in starts]
+            else:
+                seeds = np.random.SeedSequence(seed).spawn(len(starts))
+
+            tasks = []
+            for start, chunk_seed in zip(starts, seeds):
+                tasks.append(
+                    {
+                        "func": func,
+                        "kwargs": kwargs,
+                        "size": size,
+                        "start": int(start),
+                        "stop": int(min(start + chunk_size, size)),
+                        "seed": chunk_seed,
+                        "inputs": inputs,
+                        "outputs": outputs,
+                    }
+                )
+
+            if len(tasks) > 0:
+                self._pool.map(_work, tasks, chunksize=1)
+
+            res = [None for i in range(num_outputs)] if out is None else out
+            res = list(res)
+            for i, block in copy_outputs:
+                dtype = output_dtypes[i]
+                if out is None:
+                    res[i] = _read_block(block=block, dtype=dtype, size=size)
+                else:
+                    view = _view_block(block=block, dtype=dtype, size=size)
+                    np.copyto(res[i], view)
+                    del view
+        finally:
+            for block in temporary_blocks:
+                _close_block(block)
+                block.unlink()
+
+        if num_outputs == 1:
+            return res[0]
+        return tuple(res)
+
+    def _find_block(self, x):
+        """
+        Returns (name, dtype, offset) of the block of shared memory x is a
+        contiguous view into, or None if x is not in any block of this
+        executor.
+        """
+        if not x.flags.c_contiguous:
+            return None
+        address = x.__array_interface__["data"][0]
+        for shared in self._blocks:
+            offset = address - shared["address"]
+            if 0 <= offset and offset + x.nbytes <= shared["nbytes"]:
+                return (shared["block"].name, x.dtype.str, offset)
+        return None
+
+
+def _work(task):
+    attached = {}
+    try:
+        refs = list(task["inputs"].values()) + list(task["outputs"])
+        for name, _, _ in refs:
+            if name not in attached:
+                attached[name] = shared_memory.SharedMemory(name=name)
+        _work_on_views(task=task, attached=attached)
+    finally:
+        for name in attached:
+            _close_block(attached[name])
+
+
+def _work_on_views(task, attached):
+    start = task["start"]
+    stop = task["stop"]
+    size = task["size"]
+
+    kwargs = dict(task["kwargs"])
+    for key in task["inputs"]:
+        name, dtype, offset = task["inputs"][key]
+        view = _view_block(
+            block=attached[name], dtype=dtype, size=size, offset=offset
+        )
+        kwargs[key] = view[start:stop]
+    if task["seed"] is not None:
+        kwargs["prng"] = np.random.Generator(np.random.PCG64(task["seed"]))
+        kwargs["size"] = stop - start
+
+    results = task["func"](**kwargs)
+    if len(task["outputs"]) == 1:
+        results = (results,)
+    assert len(results) == len(task["outputs"])
+
+    for (name, dtype, offset), result in zip(task["outputs"], results):
+        result = np.asarray(result)
+        assert np.can_cast(result.dtype, dtype, casting="safe")
+        view = _view_block(
+            block=attached[name], dtype=dtype, size=size, offset=offset
+        )
+        view[start:stop] = result
+
+
+def _create_block(nbytes):
+    # shared memory can not be empty
+    return shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+
+
+def _view_block(block, dtype, size, offset=0):
+    return np.ndarray(
+        shape=(size,), dtype=dtype, buffer=block.buf, offset=offset
+    )
+
+
+def _address(block):
+    view = np.frombuffer(block.buf, dtype=np.uint8)
+    return view.__array_interface__["data"][0]
+
+
+def _write_block(block, dtype, size, x):
+    view = _view_block(block=block, dtype=dtype, size=size)
+    view[:] = x
+
+
+def _read_block(block, dtype, size):
+    view = _view_block(block=block, dtype=dtype, size=size)
+    return np.array(view)
+
+
+def _close_block(block):
+    try:
+        block.close()
+    except BufferError:
+        # A view is still referenced, e.g. by the traceback of an error.
+        # The memory is released at the latest when the process exits.
+        pass
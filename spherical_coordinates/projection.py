@@ -0,0 +1,186 @@
+from . import base
+from . import dimensionality
+import numpy as np
+
+PROJECTIONS = ("gnomonic", "stereographic", "orthographic")
+
+
+def init_tangent_plane(azimuth_rad, zenith_rad):
+    """
+    Returns the tangent plane which touches the unit sphere in the pointing
+    (azimuth, zenith distance). The constants of the pointing are computed
+    once here and reused for all projections onto this plane.
+    The plane's x-axis and y-axis are the images of the x-axis and y-axis
+    under the rotation which turns the z-axis into the pointing.
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth angle of pointing.
+    zenith_rad : float
+        Zenith distance angle of pointing.
+
+    Returns
+    -------
+    tangent_plane : dict
+    """
+    rot = base._rotation_matrix_az_zd(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+    return {
+        "azimuth_rad": float(azimuth_rad),
+        "zenith_rad": float(zenith_rad),
+        "ex": rot[:, 0].copy(),
+        "ey": rot[:, 1].copy(),
+        "ez": rot[:, 2].copy(),
+    }
+
+
+def cx_cy_cz_to_x_y(
+    tangent_plane, cx, cy, cz, projection="gnomonic", out=None
+):
+    """
+    Projects directions (cx, cy, cz) onto the tangent plane.
+
+    gnomonic
+        x = tan(theta) cos(phi), where theta is the angle to the pointing.
+        Directions with theta >= PI/2 become nan.
+    stereographic
+        x = 2 tan(theta/2) cos(phi). Conformal. Only theta = PI is
+        singular and becomes nan.
+    orthographic
+        x = sin(theta) cos(phi). Directions with theta > PI/2 become nan.
+
+    Parameters
+    ----------
+    tangent_plane : dict
+        See init_tangent_plane().
+    cx : float or array like
+        X component of cartesian direction vectors with length 1.0.
+    cy : float or array like
+        Y component.
+    cz : float or array like
+        Z component.
+    projection : str
+        One of PROJECTIONS.
+    out : tuple(array, array) or None
+        Arrays to write x and y into. New arrays are allocated if None.
+
+    Returns
+    -------
+    (x, y) : (float, float)
+        Coordinates on the tangent plane. The arrays in out if given.
+
+    See also the inverse: x_y_to_cx_cy_cz()
+    """
+    assert projection in PROJECTIONS
+    is_scalar, cx = dimensionality._in(x=cx)
+    _, cy = dimensionality._in(x=cy)
+    _, cz = dimensionality._in(x=cz)
+    x, y = dimensionality._out_buffers(out=out, num=2, shape=cx.shape)
+    w = np.empty(shape=cx.shape)
+    tmp = np.empty(shape=cx.shape)
+
+    _dot(cx, cy, cz, e=tangent_plane["ex"], out=x, tmp=tmp)
+    _dot(cx, cy, cz, e=tangent_plane["ey"], out=y, tmp=tmp)
+    _dot(cx, cy, cz, e=tangent_plane["ez"], out=w, tmp=tmp)
+
+    if projection == "gnomonic":
+        np.copyto(w, np.nan, where=w <= 0.0)
+        np.divide(1.0, w, out=w)
+    elif projection == "stereographic":
+        w += 1.0
+        np.copyto(w, np.nan, where=w <= 0.0)
+        np.divide(2.0, w, out=w)
+    else:
+        np.greater_equal(w, 0.0, out=w)
+        np.copyto(w, np.nan, where=w == 0.0)
+    x *= w
+    y *= w
+
+    return (
+        dimensionality._out(is_scalar=is_scalar, x=x),
+        dimensionality._out(is_scalar=is_scalar, x=y),
+    )
+
+
+def x_y_to_cx_cy_cz(tangent_plane, x, y, projection="gnomonic", out=None):
+    """
+    Returns the directions (cx, cy, cz) of the coordinates (x, y) on the
+    tangent plane. See cx_cy_cz_to_x_y(). For the orthographic projection,
+    x**2 + y**2 > 1 becomes nan.
+
+    Parameters
+    ----------
+    tangent_plane : dict
+        See init_tangent_plane().
+    x : float or array like
+        Coordinate on the tangent plane.
+    y : float or array like
+        Coordinate on the tangent plane.
+    projection : str
+        One of PROJECTIONS.
+    out : tuple(array, array, array) or None
+        Arrays to write cx, cy, and cz into. New arrays are allocated if
+        None.
+
+    Returns
+    -------
+    (cx, cy, cz) : (float, float, float)
+        A cartesian vector with length 1.0. The arrays in out if given.
+    """
+    assert projection in PROJECTIONS
+    is_scalar, x = dimensionality._in(x=x)
+    _, y = dimensionality._in(x=y)
+    cx, cy, cz = dimensionality._out_buffers(out=out, num=3, shape=x.shape)
+    w = np.empty(shape=x.shape)
+    scale = np.empty(shape=x.shape)
+    tmp = np.empty(shape=x.shape)
+
+    # r2 = x**2 + y**2
+    np.multiply(x, x, out=w)
+    np.multiply(y, y, out=tmp)
+    w += tmp
+
+    if projection == "gnomonic":
+        w += 1.0
+        np.sqrt(w, out=w)
+        np.divide(1.0, w, out=w)
+        scale[:] = w
+    elif projection == "stereographic":
+        w += 4.0
+        np.divide(4.0, w, out=scale)
+        np.subtract(8.0, w, out=w)
+        np.divide(w, 4.0, out=w)
+        w *= scale
+    else:
+        np.subtract(1.0, w, out=w)
+        np.copyto(w, np.nan, where=w < 0.0)
+        np.sqrt(w, out=w)
+        scale[:] = 1.0
+
+    ex = tangent_plane["ex"]
+    ey = tangent_plane["ey"]
+    ez = tangent_plane["ez"]
+    for i, c in enumerate([cx, cy, cz]):
+        np.multiply(w, ez[i], out=c)
+        np.multiply(x, ex[i], out=tmp)
+        tmp *= scale
+        c += tmp
+        np.multiply(y, ey[i], out=tmp)
+        tmp *= scale
+        c += tmp
+
+    return (
+        dimensionality._out(is_scalar=is_scalar, x=cx),
+        dimensionality._out(is_scalar=is_scalar, x=cy),
+        dimensionality._out(is_scalar=is_scalar, x=cz),
+    )
+
+
+def _dot(cx, cy, cz, e, out, tmp):
+    np.multiply(cx, e[0], out=out)
+    np.multiply(cy, e[1], out=tmp)
+    out += tmp
+    np.multiply(cz, e[2], out=tmp)
+    out += tmp
@@ -0,0 +1,172 @@
+from . import base
+from . import dimensionality
+import numpy as np
+
+
+def to_horizontal_plane(
+    x, y, z, cx, cy, plane_z, cz=None, out=None, eps=1e-6, backwards=False
+):
+    """
+    Propagates photons (or particles) along straight lines to a horizontal
+    plane and returns where they intersect it. A photon at (x, y, z) runs
+    along its momentum which is the negative of its incident direction
+    (cx, cy, cz), see corsika.ux_to_cx(). Photons which run away from the
+    plane do not hit it and become nan unless 'backwards' is True.
+
+    Parameters
+    ----------
+    x : array like
+        Position of photons.
+    y : array like
+        Position of photons.
+    z : float or array like
+        Position of photons, e.g. the altitude of the observation level.
+    cx : array like
+        X component of incident direction of photons.
+    cy : array like
+        Y component of incident direction of photons.
+    plane_z : float
+        Altitude of the plane.
+    cz : array like or None
+        Z component of incident direction of photons. If None, it is
+        restored assuming cz > 0, see restore_cz().
+    out : tuple(array, array) or None
+        Arrays to write the x and y of the intersections into.
+        New arrays are allocated if None.
+    eps : float
+        See restore_cz().
+    backwards : bool
+        If True, photons which run away from the plane are propagated
+        backwards to where they would have crossed it.
+
+    Returns
+    -------
+    (x, y) : (array, array)
+        Intersections with the plane. Photons parallel to the plane (cz = 0),
+        running away from it, or with cx**2 + cy**2 > 1 + eps become nan.
+        The arrays in out if given.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    cx = np.asarray(cx)
+    cy = np.asarray(cy)
+    if cz is None:
+        cz = base.restore_cz(cx=cx, cy=cy, eps=eps)
+    out_x, out_y = dimensionality._out_buffers(out=out, num=2, shape=x.shape)
+
+    # path length
+    t = np.subtract(z, plane_z, dtype=float)
+    t = np.broadcast_to(t, x.shape).copy()
+    _path_length(t, cz, backwards=backwards)
+
+    np.multiply(t, cx, out=out_x)
+    np.subtract(x, out_x, out=out_x)
+    np.multiply(t, cy, out=out_y)
+    np.subtract(y, out_y, out=out_y)
+    return out_x, out_y
+
+
+def to_plane_of_pointing(
+    x,
+    y,
+    z,
+    cx,
+    cy,
+    azimuth_rad,
+    zenith_rad,
+    support=(0.0, 0.0, 0.0),
+    cz=None,
+    out=None,
+    eps=1e-6,
+    backwards=False,
+):
+    """
+    Propagates photons (or particles) along straight lines to a tilted
+    plane perpendicular to a pointing, e.g. the aperture of a telescope,
+    and returns where they intersect it. See to_horizontal_plane().
+
+    Parameters
+    ----------
+    x : array like
+        Position of photons.
+    y : array like
+        Position of photons.
+    z : float or array like
+        Position of photons.
+    cx : array like
+        X component of incident direction of photons.
+    cy : array like
+        Y component of incident direction of photons.
+    azimuth_rad : float
+        Azimuth angle of the pointing, i.e. the normal of the plane.
+    zenith_rad : float
+        Zenith distance angle of the pointing.
+    support : tuple(float, float, float)
+        A point on the plane. It is the origin of the plane's coordinates.
+    cz : array like or None
+        Z component of incident direction of photons. If None, it is
+        restored assuming cz > 0, see restore_cz().
+    out : tuple(array, array) or None
+        Arrays to write the plane's coordinates (u, v) into.
+    eps : float
+        See restore_cz().
+    backwards : bool
+        See to_horizontal_plane().
+
+    Returns
+    -------
+    (u, v) : (array, array)
+        Intersections in the plane's coordinates. The axes u and v are the
+        x and y axes of the tangent plane of the pointing, see
+        projection.init_tangent_plane(). The arrays in out if given.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    z = np.asarray(z)
+    cx = np.asarray(cx)
+    cy = np.asarray(cy)
+    if cz is None:
+        cz = base.restore_cz(cx=cx, cy=cy, eps=eps)
+    out_u, out_v = dimensionality._out_buffers(out=out, num=2, shape=x.shape)
+
+    rot = base._rotation_matrix_az_zd(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+    eu = rot[:, 0]
+    ev = rot[:, 1]
+    en = rot[:, 2]
+    pos = [x, y, z]
+    dirs = [cx, cy, cz]
+
+    # path length t = <position - support, normal> / <direction, normal>
+    tmp = np.empty(shape=x.shape)
+    t = np.zeros(shape=x.shape)
+    denom = np.zeros(shape=x.shape)
+    for i in range(3):
+        np.subtract(pos[i], support[i], out=tmp)
+        tmp *= en[i]
+        t += tmp
+        np.multiply(dirs[i], en[i], out=tmp)
+        denom += tmp
+    _path_length(t, denom, backwards=backwards)
+
+    # <position - t * direction - support, axis>
+    for o, axis in [(out_u, eu), (out_v, ev)]:
+        o[:] = 0.0
+        for i in range(3):
+            np.multiply(t, dirs[i], out=tmp)
+            np.subtract(pos[i], tmp, out=tmp)
+            tmp -= support[i]
+            tmp *= axis[i]
+            o += tmp
+    return out_u, out_v
+
+
+def _path_length(distance, speed, backwards):
+    # in place, nan for photons parallel to the plane
+    fine = np.asarray(speed) != 0.0
+    np.divide(distance, speed, out=distance, where=fine)
+    np.copyto(distance, np.nan, where=np.logical_not(fine))
+    if not backwards:
+        np.copyto(distance, np.nan, where=distance < 0.0)
+    return distance
@@ -42,12 +42,52 @@ def uniform_az_zd_in_cone(
     rd1 = prng.uniform(size=size)
     rd2 = prng.uniform(size=size)
 
+    return _az_zd_in_cone(
+        rd1=rd1,
+        rd2=rd2,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+        min_half_angle_rad=min_half_angle_rad,
+        max_half_angle_rad=max_half_angle_rad,
+    )
+
+
+def _az_zd_in_cone(
+    rd1,
+    rd2,
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+):
+    """
+    Maps numbers (rd1, rd2) from the unit square [0, 1)^2 onto pointings
+    (azimuth, zenith distance) within a cone so that uniformly distributed
+    numbers become pointings which are uniform w.r.t. the solid angle.
+    See uniform_az_zd_in_cone().
+    """
     ct1 = np.cos(min_half_angle_rad)
     ct2 = np.cos(max_half_angle_rad)
     ctt = rd2 * (ct2 - ct1) + ct1
-    theta = np.arccos(ctt)
     phi = rd1 * np.pi * 2.0
 
+    return _az_zd_around_axis(
+        cos_theta=ctt,
+        phi_rad=phi,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+    )
+
+
+def _az_zd_around_axis(cos_theta, phi_rad, azimuth_rad, zenith_rad):
+    """
+    Returns the pointings (azimuth, zenith distance) of directions given
+    relative to the axis of a cone. See _rotate_into_cone() for the
+    cartesian counterpart.
+    """
+    theta = np.arccos(cos_theta)
+    phi = phi_rad
+
     # TEMPORARY CARTESIAN COORDINATES
     xvc1, yvc1, zvc1 = base.az_zd_to_cx_cy_cz(
         azimuth_rad=phi, zenith_rad=theta
@@ -67,3 +107,704 @@ def uniform_az_zd_in_cone(
     az = base.azimuth_range(azimuth_rad=az)
 
     return az, zd
+
+
+def uniform_cx_cy_cz_in_cone(
+    prng,
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    size=None,
+    rotation_matrix_az_zd=None,
+):
+    """
+    Draw a random pointing (cx, cy, cz) from within a cone. Same distribution
+    and same consumption of the prng as uniform_az_zd_in_cone() but without
+    the round trip through the azimuth-zenith representation.
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    min_half_angle_rad : float
+        Minimum half angle of cone.
+    max_half_angle_rad : float
+        Maximum half angle of cone.
+    size : int or None (default None)
+        The size (number) of points to be drawn. Behaviour adopted from
+        numpy.random.
+    rotation_matrix_az_zd : function or None
+        Returns the rotation into the cone's pointing. Pass e.g.
+        memo.rotation_matrix_az_zd to reuse the rotation when many small
+        batches are drawn from the same cone. Default computes it each call.
+
+    Returns
+    -------
+    (cx, cy, cz) : (float, float, float)
+        A cartesian vector with length 1.0. If size is not None, the return
+        values will be array like.
+    """
+    assert min_half_angle_rad >= 0.0
+    assert max_half_angle_rad >= min_half_angle_rad
+
+    # Adopted from CORSIKA
+    rd1 = prng.uniform(size=size)
+    rd2 = prng.uniform(size=size)
+
+    ct1 = np.cos(min_half_angle_rad)
+    ct2 = np.cos(max_half_angle_rad)
+    ctt = rd2 * (ct2 - ct1) + ct1
+    phi = rd1 * np.pi * 2.0
+
+    return _rotate_into_cone(
+        cos_theta=ctt,
+        phi_rad=phi,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+        rotation_matrix_az_zd=rotation_matrix_az_zd,
+    )
+
+
+def _rotate_into_cone(
+    cos_theta, phi_rad, azimuth_rad, zenith_rad, rotation_matrix_az_zd=None
+):
+    """
+    Returns the cartesian vectors (cx, cy, cz) of directions given relative to
+    the axis of a cone. The rotation into the pointing of the cone's axis is
+    applied as a single matrix product.
+
+    Parameters
+    ----------
+    cos_theta : float or array like
+        Cosine of the angle between the direction and the cone's axis.
+    phi_rad : float or array like
+        Angle of the direction around the cone's axis.
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    rotation_matrix_az_zd : function or None
+        See uniform_cx_cy_cz_in_cone().
+    """
+    if rotation_matrix_az_zd is None:
+        rotation_matrix_az_zd = base._rotation_matrix_az_zd
+    sin_theta = np.sqrt(np.maximum(1.0 - cos_theta**2, 0.0))
+    local = np.stack(
+        [
+            np.cos(phi_rad) * sin_theta,
+            np.sin(phi_rad) * sin_theta,
+            cos_theta,
+        ]
+    )
+    rot = rotation_matrix_az_zd(azimuth_rad=azimuth_rad, zenith_rad=zenith_rad)
+    shape = local.shape
+    cxcycz = np.matmul(rot, local.reshape((3, -1))).reshape(shape)
+    return cxcycz[0], cxcycz[1], cxcycz[2]
+
+
+def init_alias_table(weights):
+    """
+    Returns a Walker/Vose alias table to draw indices i with probability
+    proportional to weights[i] in O(1) per draw.
+
+    Parameters
+    ----------
+    weights : array like, shape=(N,)
+        Non negative weights. At least one weight must be positive.
+
+    Returns
+    -------
+    alias_table : dict
+        With the arrays 'probability' and 'alias'. The table only contains
+        numpy arrays and can be stored e.g. with numpy.savez() to be reused
+        in other calls and processes.
+    """
+    weights = np.asarray(weights, dtype=float).ravel()
+    assert len(weights) > 0
+    assert np.all(weights >= 0.0)
+    total = np.sum(weights)
+    assert total > 0.0
+
+    num = len(weights)
+    scaled = list(weights * (num / total))
+    probability = np.ones(num)
+    alias = np.arange(num)
+
+    small = [i for i in range(num) if scaled[i] < 1.0]
+    large = [i for i in range(num) if scaled[i] >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        probability[s] = scaled[s]
+        alias[s] = g
+        scaled[g] = (scaled[g] + scaled[s]) - 1.0
+        if scaled[g] < 1.0:
+            small.append(g)
+        else:
+            large.append(g)
+
+    # Left overs are only due to numeric rounding and have probability 1.
+    return {"probability": probability, "alias": alias}
+
+
+def draw_from_alias_table(prng, alias_table, size=None):
+    """
+    Draw random indices from an alias table.
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    alias_table : dict
+        See init_alias_table().
+    size : int or None (default None)
+        The size (number) of indices to be drawn. Behaviour adopted from
+        numpy.random.
+
+    Returns
+    -------
+    index : int or array of ints
+    """
+    probability = alias_table["probability"]
+    alias = alias_table["alias"]
+    candidate = prng.integers(low=0, high=len(probability), size=size)
+    accept = prng.uniform(size=size) < probability[candidate]
+    index = np.where(accept, candidate, alias[candidate])
+    if size is None:
+        return index.item()
+    return index
+
+
+def init_sky_map(azimuth_bin_edges_rad, zenith_bin_edges_rad, weights):
+    """
+    Returns a sky map to draw random pointings (azimuth, zenith distance)
+    from a tabulated distribution of cells on the sky.
+
+    Parameters
+    ----------
+    azimuth_bin_edges_rad : array like, shape=(A + 1,)
+        Increasing edges of the azimuth bins.
+    zenith_bin_edges_rad : array like, shape=(Z + 1,)
+        Increasing edges of the zenith distance bins within [0, PI].
+    weights : array like, shape=(A, Z)
+        Non negative weight of each cell. The weight is the probability to
+        draw a pointing from within the cell, not a density per solid angle.
+
+    Returns
+    -------
+    sky_map : dict
+        The bin edges together with the alias table of the cells.
+        See init_alias_table().
+    """
+    azimuth_bin_edges_rad = np.asarray(azimuth_bin_edges_rad, dtype=float)
+    zenith_bin_edges_rad = np.asarray(zenith_bin_edges_rad, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+
+    assert np.all(np.diff(azimuth_bin_edges_rad) > 0.0)
+    assert np.all(np.diff(zenith_bin_edges_rad) > 0.0)
+    assert zenith_bin_edges_rad[0] >= 0.0
+    assert zenith_bin_edges_rad[-1] <= np.pi
+    assert weights.shape == (
+        len(azimuth_bin_edges_rad) - 1,
+        len(zenith_bin_edges_rad) - 1,
+    )
+
+    sky_map = init_alias_table(weights=weights)
+    sky_map["azimuth_bin_edges_rad"] = azimuth_bin_edges_rad
+    sky_map["zenith_bin_edges_rad"] = zenith_bin_edges_rad
+    return sky_map
+
+
+def az_zd_from_sky_map(prng, sky_map, size=None):
+    """
+    Draw random pointings (azimuth, zenith distance) from a sky map.
+    First a cell is drawn from the sky map's alias table, then the pointing
+    is drawn uniformly w.r.t. the solid angle within the cell.
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    sky_map : dict
+        See init_sky_map().
+    size : int or None (default None)
+        The size (number) of points to be drawn. Behaviour adopted from
+        numpy.random.
+
+    Returns
+    -------
+    (azimuth, zenith distance) : (float, float)
+        In rad. If size is not None, the return values will be array like.
+    """
+    az_edges = sky_map["azimuth_bin_edges_rad"]
+    zd_edges = sky_map["zenith_bin_edges_rad"]
+
+    cell = draw_from_alias_table(prng=prng, alias_table=sky_map, size=size)
+    a, z = np.unravel_index(cell, (len(az_edges) - 1, len(zd_edges) - 1))
+
+    rd1 = prng.uniform(size=size)
+    rd2 = prng.uniform(size=size)
+
+    az = az_edges[a] + rd1 * (az_edges[a + 1] - az_edges[a])
+    ct1 = np.cos(zd_edges[z])
+    ct2 = np.cos(zd_edges[z + 1])
+    zd = np.arccos(rd2 * (ct2 - ct1) + ct1)
+
+    az = base.azimuth_range(azimuth_rad=az)
+    return az, zd
+
+
+def halton_az_zd_in_cone(
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    size,
+    start=0,
+    prng=None,
+):
+    """
+    Returns quasi random pointings (azimuth, zenith distance) from within a
+    cone. The pointings are the 2D Halton sequence (bases 2 and 3) mapped
+    just like in uniform_az_zd_in_cone(). For integrals over the cone, the
+    low discrepancy of the sequence converges faster than pseudo random
+    pointings.
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    min_half_angle_rad : float
+        Minimum half angle of cone.
+    max_half_angle_rad : float
+        Maximum half angle of cone.
+    size : int
+        The size (number) of points.
+    start : int (default 0)
+        Index of the first point in the sequence. Use this to continue a
+        sequence in chunks.
+    prng : numpy.random.Generator or None (default None)
+        If given, the sequence is scrambled by a random shift modulo 1
+        (Cranley-Patterson rotation). Independent scramblings allow to
+        estimate the error of an integral. To continue a scrambled sequence,
+        pass a prng with the same seed again.
+
+    Returns
+    -------
+    (azimuth, zenith distance) : (array, array)
+        In rad.
+    """
+    index = _quasi_random_index(start=start, size=size)
+    rd1 = _radical_inverse(index=index, base=2)
+    rd2 = _radical_inverse(index=index, base=3)
+    rd1, rd2 = _cranley_patterson_rotation(prng=prng, rd1=rd1, rd2=rd2)
+
+    return _az_zd_in_cone(
+        rd1=rd1,
+        rd2=rd2,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+        min_half_angle_rad=min_half_angle_rad,
+        max_half_angle_rad=max_half_angle_rad,
+    )
+
+
+def sobol_az_zd_in_cone(
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    size,
+    start=0,
+    prng=None,
+):
+    """
+    Returns quasi random pointings (azimuth, zenith distance) from within a
+    cone. The pointings are the first two dimensions of the Sobol sequence
+    mapped just like in uniform_az_zd_in_cone(). The sequence has 32 bits,
+    so start + size must not exceed 2**32.
+    See halton_az_zd_in_cone() for the parameters and returns.
+    """
+    assert start + size <= 2**32, "Sobol sequence has only 2**32 points."
+    index = _quasi_random_index(start=start, size=size)
+    rd1, rd2 = _sobol_2d(index=index)
+    rd1, rd2 = _cranley_patterson_rotation(prng=prng, rd1=rd1, rd2=rd2)
+
+    return _az_zd_in_cone(
+        rd1=rd1,
+        rd2=rd2,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+        min_half_angle_rad=min_half_angle_rad,
+        max_half_angle_rad=max_half_angle_rad,
+    )
+
+
+def fibonacci_az_zd_in_cone(
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    size,
+    prng=None,
+):
+    """
+    Returns the pointings (azimuth, zenith distance) of a Fibonacci lattice
+    within a cone. For a full cone (max_half_angle_rad = PI) this is the
+    Fibonacci sphere. Other than the Halton and Sobol sequences, the lattice
+    depends on its size and can not be continued.
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    min_half_angle_rad : float
+        Minimum half angle of cone.
+    max_half_angle_rad : float
+        Maximum half angle of cone.
+    size : int
+        The size (number) of points in the lattice.
+    prng : numpy.random.Generator or None (default None)
+        If given, the lattice is scrambled by a random shift modulo 1
+        (Cranley-Patterson rotation).
+
+    Returns
+    -------
+    (azimuth, zenith distance) : (array, array)
+        In rad.
+    """
+    GOLDEN_RATIO = (1.0 + np.sqrt(5.0)) / 2.0
+    index = _quasi_random_index(start=0, size=size)
+    rd1 = np.mod(index / GOLDEN_RATIO, 1.0)
+    rd2 = (index + 0.5) / size
+    rd1, rd2 = _cranley_patterson_rotation(prng=prng, rd1=rd1, rd2=rd2)
+
+    return _az_zd_in_cone(
+        rd1=rd1,
+        rd2=rd2,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+        min_half_angle_rad=min_half_angle_rad,
+        max_half_angle_rad=max_half_angle_rad,
+    )
+
+
+def _quasi_random_index(start, size):
+    assert start >= 0
+    assert size >= 0
+    return np.arange(start, start + size, dtype=np.uint64)
+
+
+def _radical_inverse(index, base):
+    """
+    Returns the radical inverse of the indices in the given base. This is
+    the van der Corput sequence and one dimension of the Halton sequence.
+    """
+    index = np.array(index, dtype=np.uint64)
+    base = np.uint64(base)
+    out = np.zeros(shape=index.shape)
+    factor = 1.0 / float(base)
+    while np.any(index > 0):
+        out += factor * (index % base)
+        index //= base
+        factor /= float(base)
+    return out
+
+
+def _sobol_2d(index):
+    """
+    Returns the first two dimensions of the Sobol sequence with 32 bits.
+    The 1st dimension is the van der Corput sequence in base 2, the 2nd one
+    uses the primitive polynomial x + 1. Indices must be below 2**32,
+    higher bits would be ignored and repeat the sequence.
+    """
+    NUM_BITS = 32
+    index = np.asarray(index, dtype=np.uint64)
+    assert np.all(index < np.uint64(1 << NUM_BITS))
+    v1 = [np.uint64(1 << (NUM_BITS - 1 - k)) for k in range(NUM_BITS)]
+    v2 = [np.uint64(1 << (NUM_BITS - 1))]
+    for k in range(1, NUM_BITS):
+        v2.append(v2[k - 1] ^ (v2[k - 1] >> np.uint64(1)))
+
+    x1 = np.zeros(shape=index.shape, dtype=np.uint64)
+    x2 = np.zeros(shape=index.shape, dtype=np.uint64)
+    for k in range(NUM_BITS):
+        bit = ((index >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        x1[bit] ^= v1[k]
+        x2[bit] ^= v2[k]
+
+    scale = 1.0 / float(1 << NUM_BITS)
+    return x1 * scale, x2 * scale
+
+
+def _cranley_patterson_rotation(prng, rd1, rd2):
+    if prng is None:
+        return rd1, rd2
+    shift = prng.uniform(size=2)
+    return np.mod(rd1 + shift[0], 1.0), np.mod(rd2 + shift[1], 1.0)
+
+
+def power_law_az_zd_in_cone(
+    prng,
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    power_index,
+    size=None,
+):
+    """
+    Draw a random pointing (azimuth, zenith distance) from within a cone
+    where the density w.r.t. the solid angle is proportional to
+    cos(theta)**power_index. Here theta is the angle between the pointing
+    and the cone's axis. Drawn using the inverse of the cumulative
+    distribution, so no draws are rejected.
+
+    For a cone pointing to the zenith, power_index=1 is the isotropic flux
+    through a horizontal plane.
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    min_half_angle_rad : float
+        Minimum half angle of cone.
+    max_half_angle_rad : float
+        Maximum half angle of cone. Can be up to PI when power_index is 0 or
+        a positive even integer. Otherwise cos(theta)**power_index is not a
+        density for cos(theta) < 0 and it must not exceed PI/2, or be below
+        PI/2 when power_index <= -1.
+    power_index : float
+        Exponent of cos(theta).
+    size : int or None (default None)
+        The size (number) of points to be drawn. Behaviour adopted from
+        numpy.random.
+
+    Returns
+    -------
+    (azimuth, zenith distance, weight) : (float, float, float)
+        In rad. The weight is the ratio of the density which is uniform
+        w.r.t. the solid angle (see uniform_az_zd_in_cone()) over the
+        density drawn from. It can be used to reweight the pointings to be
+        uniform w.r.t. the solid angle. If size is not None, the return
+        values will be array like.
+    """
+    assert min_half_angle_rad >= 0.0
+    assert max_half_angle_rad >= min_half_angle_rad
+    assert max_half_angle_rad <= np.pi
+
+    rd1 = prng.uniform(size=size)
+    rd2 = prng.uniform(size=size)
+
+    ct1 = np.cos(min_half_angle_rad)
+    ct2 = np.cos(max_half_angle_rad)
+    k = float(power_index)
+    is_even = k >= 0.0 and k == np.round(k) and k % 2 == 0
+    if not is_even:
+        assert max_half_angle_rad <= np.pi / 2
+
+    if ct1 == ct2:
+        ctt = ct1 * np.ones(shape=np.shape(rd2))
+        weight = np.ones(shape=np.shape(rd2))
+    elif k == -1.0:
+        assert ct2 > 0.0
+        log_ratio = np.log(ct2 / ct1)
+        ctt = ct1 * np.exp(rd2 * log_ratio)
+        weight = ctt * (-log_ratio) / (ct1 - ct2)
+    else:
+        if k < -1.0:
+            assert ct2 > 0.0
+        kp1 = k + 1.0
+        pt1 = _signed_power(ct1, kp1)
+        pt2 = _signed_power(ct2, kp1)
+        ctt = _signed_power(rd2 * (pt2 - pt1) + pt1, 1.0 / kp1)
+        weight = (pt1 - pt2) / (kp1 * ctt**k * (ct1 - ct2))
+
+    phi = rd1 * np.pi * 2.0
+    az, zd = _az_zd_around_axis(
+        cos_theta=ctt,
+        phi_rad=phi,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+    )
+    if size is None:
+        weight = float(weight)
+    return az, zd, weight
+
+
+def cos_weighted_az_zd_in_cone(
+    prng,
+    azimuth_rad,
+    zenith_rad,
+    min_half_angle_rad,
+    max_half_angle_rad,
+    size=None,
+):
+    """
+    Draw a random pointing (azimuth, zenith distance) from within a cone
+    where the density w.r.t. the solid angle is proportional to
+    cos(zenith distance). This is the isotropic flux through a horizontal
+    plane, e.g. a flat detector on the ground, seen through the cone. For a
+    cone pointing to the zenith this is power_law_az_zd_in_cone() with
+    power_index=1.
+
+    The angle theta to the cone's axis is drawn from its marginal density
+    which is proportional to cos(theta). The angle around the axis is drawn
+    by inverting its conditional cumulative distribution numerically. No
+    draws are rejected.
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    azimuth_rad : float
+        Azimuth pointing of cone.
+    zenith_rad : float
+        Zenith distance pointing of cone.
+    min_half_angle_rad : float
+        Minimum half angle of cone.
+    max_half_angle_rad : float
+        Maximum half angle of cone. The cone must not reach below the
+        horizon, i.e. zenith_rad + max_half_angle_rad <= PI/2.
+    size : int or None (default None)
+        The size (number) of points to be drawn. Behaviour adopted from
+        numpy.random.
+
+    Returns
+    -------
+    (azimuth, zenith distance, weight) : (float, float, float)
+        See power_law_az_zd_in_cone().
+    """
+    assert min_half_angle_rad >= 0.0
+    assert max_half_angle_rad >= min_half_angle_rad
+    assert 0.0 <= zenith_rad
+    assert zenith_rad + max_half_angle_rad <= np.pi / 2 + 1e-9
+
+    rd1 = prng.uniform(size=size)
+    rd2 = prng.uniform(size=size)
+
+    ct1 = np.cos(min_half_angle_rad)
+    ct2 = np.cos(max_half_angle_rad)
+
+    # marginal density of cos(theta) is proportional to cos(theta)
+    ctt = np.sqrt(rd2 * (ct2**2 - ct1**2) + ct1**2)
+    stt = np.sqrt(np.maximum(1.0 - ctt**2, 0.0))
+
+    # The zenith ez in the frame of the cone. In this frame
+    # cos(zd) = ez[2] cos(theta) + s sin(theta) cos(phi - phi0)
+    # with s = hypot(ez[0], ez[1]).
+    ez = base._rotation_matrix_az_zd(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )[2]
+    phi0 = np.arctan2(ez[1], ez[0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kappa = np.hypot(ez[0], ez[1]) * stt / (ez[2] * ctt)
+    kappa = np.where(np.isfinite(kappa), np.minimum(kappa, 1.0), 0.0)
+
+    # conditional cumulative distribution of phi - phi0 in [-PI, PI)
+    # is (x + PI + kappa sin(x)) / TAU which is monotonic for kappa <= 1.
+    x = _solve_x_plus_kappa_sin_x(y=(rd1 - 0.5) * 2.0 * np.pi, kappa=kappa)
+    phi = x + phi0
+
+    az, zd = _az_zd_around_axis(
+        cos_theta=ctt,
+        phi_rad=phi,
+        azimuth_rad=azimuth_rad,
+        zenith_rad=zenith_rad,
+    )
+
+    # uniform: 1 / (TAU (ct1 - ct2))
+    # drawn: cos(zd) / (PI ez[2] (ct1**2 - ct2**2))
+    cos_zd = ez[2] * ctt + np.hypot(ez[0], ez[1]) * stt * np.cos(x)
+    if ct1 == ct2:
+        weight = np.ones(shape=np.shape(rd2))
+    else:
+        weight = ez[2] * (ct1 + ct2) / (2.0 * cos_zd)
+    if size is None:
+        weight = float(weight)
+    return az, zd, weight
+
+
+def _solve_x_plus_kappa_sin_x(y, kappa, num_iterations=64):
+    """
+    Returns x in [-PI, PI] so that x + kappa * sin(x) = y for
+    0 <= kappa <= 1 by bisection.
+    """
+    y = np.asarray(y, dtype=float)
+    kappa = np.broadcast_to(kappa, y.shape)
+    lo = -np.pi * np.ones(shape=y.shape)
+    hi = np.pi * np.ones(shape=y.shape)
+    for i in range(num_iterations):
+        mid = 0.5 * (lo + hi)
+        below = mid + kappa * np.sin(mid) < y
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+def _signed_power(x, exponent):
+    return np.sign(x) * np.abs(x) ** exponent
+
+
+def uniform_az_zd_in_box(
+    prng,
+    azimuth_start_rad,
+    azimuth_stop_rad,
+    zenith_start_rad,
+    zenith_stop_rad,
+    size=None,
+):
+    """
+    Draw a random pointing (azimuth, zenith distance) from within a box in
+    azimuth and zenith distance. The pointings are uniform w.r.t. the solid
+    angle. See base.is_az_zd_in_box() for the definition of the box which
+    may cross the seam at +-PI of azimuth_range().
+
+    Parameters
+    ----------
+    prng : numpy.random.Generator
+        Pseudo random number generator
+    azimuth_start_rad : float
+        Azimuth where the box starts.
+    azimuth_stop_rad : float
+        Azimuth where the box stops, in positive direction from the start.
+    zenith_start_rad : float
+        Lower zenith distance of box.
+    zenith_stop_rad : float
+        Upper zenith distance of box.
+    size : int or None (default None)
+        The size (number) of points to be drawn. Behaviour adopted from
+        numpy.random.
+
+    Returns
+    -------
+    (azimuth, zenith distance) : (float, float)
+        In rad. If size is not None, the return values will be array like.
+    """
+    assert 0.0 <= zenith_start_rad <= zenith_stop_rad <= np.pi
+    width = base._azimuth_width(
+        azimuth_start_rad=azimuth_start_rad, azimuth_stop_rad=azimuth_stop_rad
+    )
+
+    rd1 = prng.uniform(size=size)
+    rd2 = prng.uniform(size=size)
+
+    az = base.azimuth_range(azimuth_rad=azimuth_start_rad + rd1 * width)
+    ct1 = np.cos(zenith_start_rad)
+    ct2 = np.cos(zenith_stop_rad)
+    zd = np.arccos(rd2 * (ct2 - ct1) + ct1)
+    return az, zd
@@ -0,0 +1,194 @@
+from . import base
+import numpy as np
+
+
+def init(azimuth_rad, zenith_rad, max_offset_rad=np.pi, num_offset_bins=4096):
+    """
+    Returns an empty accumulator for the statistics of directions.
+    Directions are added in chunks without keeping them in memory.
+    The accumulator is a dict of numpy arrays. It can be pickled and the
+    accumulators of different threads or processes can be merged.
+
+    Parameters
+    ----------
+    azimuth_rad : float
+        Azimuth of the reference pointing. The offsets of the directions are
+        the angles to this reference, e.g. the pointing of the telescope or
+        the direction of the primary particle.
+    zenith_rad : float
+        Zenith distance of the reference pointing.
+    max_offset_rad : float
+        Largest offset in the histogram of offsets. Offsets beyond are only
+        counted as overflow.
+    num_offset_bins : int
+        Number of bins in the histogram of offsets. The containment offsets
+        are resolved to max_offset_rad / num_offset_bins.
+
+    Returns
+    -------
+    accumulator : dict
+    """
+    assert 0.0 < max_offset_rad <= np.pi
+    assert num_offset_bins > 0
+    rx, ry, rz = base.az_zd_to_cx_cy_cz(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+    return {
+        "reference_cx_cy_cz": np.array([rx, ry, rz]),
+        "sum_cx_cy_cz": np.zeros(3),
+        "num": 0,
+        "num_non_finite": 0,
+        "offset_bin_edges_rad": np.linspace(
+            0.0, max_offset_rad, num_offset_bins + 1
+        ),
+        "offset_counts": np.zeros(num_offset_bins + 1, dtype=np.uint64),
+    }
+
+
+def add_cx_cy_cz(accumulator, cx, cy, cz):
+    """
+    Adds a chunk of directions to the accumulator in place.
+
+    Parameters
+    ----------
+    accumulator : dict
+        See init().
+    cx : array like
+        X component of cartesian direction vectors with length 1.0.
+    cy : array like
+        Y component of cartesian direction vectors with length 1.0.
+    cz : array like
+        Z component of cartesian direction vectors with length 1.0.
+        Directions with non finite components, e.g. nan from restore_cz(),
+        are not added but only counted in 'num_non_finite'.
+    """
+    cx = np.asarray(cx, dtype=float).ravel()
+    cy = np.asarray(cy, dtype=float).ravel()
+    cz = np.asarray(cz, dtype=float).ravel()
+    assert cx.shape == cy.shape == cz.shape
+
+    acc = accumulator
+    finite = np.isfinite(cx)
+    finite &= np.isfinite(cy)
+    finite &= np.isfinite(cz)
+    if not np.all(finite):
+        acc["num_non_finite"] += int(len(cx) - np.sum(finite))
+        cx = cx[finite]
+        cy = cy[finite]
+        cz = cz[finite]
+
+    acc["sum_cx_cy_cz"] += [np.sum(cx), np.sum(cy), np.sum(cz)]
+    acc["num"] += len(cx)
+
+    rx, ry, rz = acc["reference_cx_cy_cz"]
+    dot = cx * rx
+    dot += cy * ry
+    dot += cz * rz
+    np.clip(dot, -1.0, 1.0, out=dot)
+    offset = np.arccos(dot, out=dot)
+
+    edges = acc["offset_bin_edges_rad"]
+    num_bins = len(edges) - 1
+    offset *= num_bins / edges[-1]
+    np.minimum(offset, num_bins, out=offset)
+    acc["offset_counts"] += np.bincount(
+        offset.astype(np.int64), minlength=num_bins + 1
+    ).astype(np.uint64)
+
+
+def add_az_zd(accumulator, azimuth_rad, zenith_rad):
+    """
+    Adds a chunk of directions to the accumulator in place.
+    See add_cx_cy_cz().
+    """
+    cx, cy, cz = base.az_zd_to_cx_cy_cz(
+        azimuth_rad=azimuth_rad, zenith_rad=zenith_rad
+    )
+    add_cx_cy_cz(accumulator=accumulator, cx=cx, cy=cy, cz=cz)
+
+
+def merge(a, b):
+    """
+    Returns a new accumulator which contains the directions of both
+    accumulators a and b. Both must have the same reference and histogram.
+    """
+    np.testing.assert_array_equal(
+        a["reference_cx_cy_cz"], b["reference_cx_cy_cz"]
+    )
+    np.testing.assert_array_equal(
+        a["offset_bin_edges_rad"], b["offset_bin_edges_rad"]
+    )
+    return {
+        "reference_cx_cy_cz": a["reference_cx_cy_cz"].copy(),
+        "sum_cx_cy_cz": a["sum_cx_cy_cz"] + b["sum_cx_cy_cz"],
+        "num": a["num"] + b["num"],
+        "num_non_finite": a["num_non_finite"] + b["num_non_finite"],
+        "offset_bin_edges_rad": a["offset_bin_edges_rad"].copy(),
+        "offset_counts": a["offset_counts"] + b["offset_counts"],
+    }
+
+
+def mean_cx_cy_cz(accumulator):
+    """
+    Returns the mean direction (cx, cy, cz) normalized to length 1.0.
+    """
+    s = accumulator["sum_cx_cy_cz"]
+    norm = np.linalg.norm(s)
+    if norm == 0.0:
+        return np.nan, np.nan, np.nan
+    return s[0] / norm, s[1] / norm, s[2] / norm
+
+
+def mean_az_zd(accumulator):
+    """
+    Returns the mean direction (azimuth, zenith distance).
+    """
+    cx, cy, cz = mean_cx_cy_cz(accumulator=accumulator)
+    az, zd = base.cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz)
+    return float(az), float(zd)
+
+
+def mean_resultant_length(accumulator):
+    """
+    Returns the length of the mean of the direction vectors. This is 1.0
+    when all directions are equal and approaches 0.0 for isotropic
+    directions. One minus this is the spherical variance.
+    """
+    if accumulator["num"] == 0:
+        return np.nan
+    s = accumulator["sum_cx_cy_cz"]
+    return float(np.linalg.norm(s) / accumulator["num"])
+
+
+def containment_offset_rad(accumulator, fraction):
+    """
+    Returns the offset to the reference which contains the given fraction of
+    the directions. The offset is interpolated linearly within the bins of
+    the histogram. Returns nan when the offset is beyond max_offset_rad.
+
+    Parameters
+    ----------
+    accumulator : dict
+        See init().
+    fraction : float
+        E.g. 0.68 or 0.95.
+
+    Returns
+    -------
+    offset_rad : float
+    """
+    assert 0.0 <= fraction <= 1.0
+    counts = accumulator["offset_counts"].astype(float)
+    num = np.sum(counts)
+    if num == 0:
+        return np.nan
+    edges = accumulator["offset_bin_edges_rad"]
+    cumulative = np.zeros(len(edges))
+    cumulative[1:] = np.cumsum(counts[:-1]) / num
+    if fraction > cumulative[-1]:
+        return np.nan
+    i = np.searchsorted(cumulative, fraction, side="left")
+    if i == 0:
+        return 0.0
+    t = (fraction - cumulative[i - 1]) / (cumulative[i] - cumulative[i - 1])
+    return float(edges[i - 1] + t * (edges[i] - edges[i - 1]))
@@ -0,0 +1,77 @@
+import spherical_coordinates as sc
+import numpy as np
+import pytest
+
+xp = pytest.importorskip("array_api_strict")
+
+
+def assert_strict_close(actual, desired):
+    assert type(actual) is type(xp.asarray(0.0))
+    np.testing.assert_array_almost_equal(np.from_dlpack(actual), desired)
+
+
+def example_az_zd():
+    az = np.linspace(-7, 7, 101)
+    zd = np.linspace(0, np.pi, 101)
+    return az, zd
+
+
+def test_az_zd_to_cx_cy_cz_and_back():
+    az, zd = example_az_zd()
+    s_az = xp.asarray(az)
+    s_zd = xp.asarray(zd)
+
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=s_az, zenith_rad=s_zd)
+    ecx, ecy, ecz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    assert_strict_close(cx, ecx)
+    assert_strict_close(cy, ecy)
+    assert_strict_close(cz, ecz)
+
+    b_az, b_zd = sc.cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz)
+    e_az, e_zd = sc.cx_cy_cz_to_az_zd(cx=ecx, cy=ecy, cz=ecz)
+    assert_strict_close(b_az, e_az)
+    assert_strict_close(b_zd, e_zd)
+
+    # scalar zenith with array azimuth
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=s_az, zenith_rad=1)
+    assert_strict_close(cz, np.cos(1.0) * np.ones(101))
+
+
+def test_hemisphere():
+    az, zd = example_az_zd()
+    zd = zd / 2.1
+    cx, cy = sc.az_zd_to_cx_cy(
+        azimuth_rad=xp.asarray(az), zenith_rad=xp.asarray(zd)
+    )
+    b_az, b_zd = sc.cx_cy_to_az_zd(cx=cx, cy=cy)
+    assert_strict_close(b_zd, zd)
+
+    cz = sc.restore_cz(cx=cx, cy=cy)
+    assert_strict_close(cz, np.cos(zd))
+
+
+def test_angles_between():
+    az, zd = example_az_zd()
+    s_az = xp.asarray(az)
+    s_zd = xp.asarray(zd)
+
+    delta = sc.angle_between_az_zd(s_az, s_zd, 0.0, 0.0)
+    assert_strict_close(delta, zd)
+
+    delta = sc.angle_between_az_zd(s_az, s_zd, s_az, s_zd)
+    assert_strict_close(delta, np.zeros(101))
+
+    a = xp.asarray([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    b = xp.asarray([[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0]])
+    assert_strict_close(sc.angle_between_xyz(a, b), [np.pi / 2, np.pi])
+
+
+def test_azimuth_range_and_arccos():
+    az, _ = example_az_zd()
+    assert_strict_close(sc.azimuth_range(xp.asarray(az)), sc.azimuth_range(az))
+
+    x = xp.asarray([1.0 + 1e-7, -1.0 - 1e-7, 0.5])
+    assert_strict_close(
+        sc.arccos_accepting_numeric_tolerance(x),
+        [0.0, np.pi, np.arccos(0.5)],
+    )
@@ -0,0 +1,105 @@
+import spherical_coordinates as sc
+import numpy as np
+import os
+import shutil
+
+
+def test_az_zd_grid(tmp_path):
+    cache_dir = str(tmp_path)
+    grid = sc.cache.az_zd_grid(
+        num_azimuth_bins=36, num_zenith_bins=9, cache_dir=cache_dir
+    )
+    assert grid["cx"].shape == (36, 9)
+    assert isinstance(grid["cx"], np.memmap)
+    assert not grid["cx"].flags.writeable
+
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(
+        azimuth_rad=grid["azimuth_rad"], zenith_rad=grid["zenith_rad"]
+    )
+    np.testing.assert_array_equal(grid["cx"], cx)
+    np.testing.assert_array_equal(grid["cy"], cy)
+    np.testing.assert_array_equal(grid["cz"], cz)
+    assert np.all(grid["zenith_rad"] < np.pi / 2)
+
+    assert len(os.listdir(cache_dir)) == 1
+    again = sc.cache.az_zd_grid(
+        num_azimuth_bins=36, num_zenith_bins=9, cache_dir=cache_dir
+    )
+    np.testing.assert_array_equal(again["cz"], grid["cz"])
+    assert len(os.listdir(cache_dir)) == 1
+
+    sc.cache.az_zd_grid(
+        num_azimuth_bins=36, num_zenith_bins=10, cache_dir=cache_dir
+    )
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_rotation_matrices(tmp_path):
+    az = [0.0, 1.0, -2.0]
+    zd = [0.0, 0.5, 1.0]
+    rot = sc.cache.rotation_matrices_az_zd(
+        azimuth_rad=az, zenith_rad=zd, cache_dir=str(tmp_path)
+    )["rotation"]
+    assert rot.shape == (3, 3, 3)
+    for i in range(3):
+        cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az[i], zenith_rad=zd[i])
+        np.testing.assert_array_almost_equal(rot[i][:, 2], [cx, cy, cz])
+
+
+def test_eviction(tmp_path):
+    cache_dir = str(tmp_path)
+    one_entry_size = 5 * 100 * 100 * 8 + 5 * 128
+    for num_zenith_bins in [100, 101, 102]:
+        sc.cache.az_zd_grid(
+            num_azimuth_bins=100,
+            num_zenith_bins=num_zenith_bins,
+            cache_dir=cache_dir,
+            max_cache_size_bytes=int(2.5 * one_entry_size),
+        )
+    assert len(os.listdir(cache_dir)) == 2
+
+    # the entry just added is kept even when it alone is too large
+    grid = sc.cache.az_zd_grid(
+        num_azimuth_bins=100,
+        num_zenith_bins=103,
+        cache_dir=cache_dir,
+        max_cache_size_bytes=0,
+    )
+    assert grid["cx"].shape == (100, 103)
+    assert len(os.listdir(cache_dir)) == 1
+
+    sc.cache.evict(cache_dir=cache_dir, max_cache_size_bytes=0)
+    assert len(os.listdir(cache_dir)) == 0
+
+
+def test_stale_tmp_dirs_are_removed(tmp_path):
+    cache_dir = str(tmp_path)
+    stale = os.path.join(cache_dir, ".tmp_crashed")
+    fresh = os.path.join(cache_dir, ".tmp_building")
+    os.makedirs(stale)
+    os.makedirs(fresh)
+    old = os.path.getmtime(stale) - 2 * sc.cache.MAX_TMP_AGE_S
+    os.utime(stale, (old, old))
+
+    sc.cache.evict(cache_dir=cache_dir)
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_vanished_entry_is_added_again(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    load = sc.cache._load
+    calls = []
+
+    def load_after_other_process_evicted(path):
+        calls.append(path)
+        if len(calls) == 1:
+            shutil.rmtree(path)
+        return load(path)
+
+    monkeypatch.setattr(sc.cache, "_load", load_after_other_process_evicted)
+    grid = sc.cache.az_zd_grid(
+        num_azimuth_bins=4, num_zenith_bins=3, cache_dir=cache_dir
+    )
+    assert len(calls) == 2
+    assert grid["cx"].shape == (4, 3)
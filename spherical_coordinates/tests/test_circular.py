@@ -0,0 +1,133 @@
+import spherical_coordinates as sc
+import numpy as np
+import warnings
+
+
+def test_wrap_and_wrapped_difference():
+    prng = np.random.Generator(np.random.PCG64(21))
+    a = prng.uniform(low=-20, high=20, size=10000)
+    b = prng.uniform(low=-20, high=20, size=10000)
+    a = np.r_[a, np.pi, -np.pi, 3 * np.pi, 0.0]
+    b = np.r_[b, 0.0, 0.0, 0.0, 0.0]
+
+    np.testing.assert_allclose(
+        sc.circular.wrap(a), sc.azimuth_range(a), atol=1e-12
+    )
+
+    out = np.zeros(a.shape)
+    d = sc.circular.wrapped_difference(a, b, out=out)
+    assert d is out
+    assert np.all(d > -np.pi)
+    assert np.all(d <= np.pi)
+    np.testing.assert_allclose(d, sc.azimuth_range(a - b), atol=1e-12)
+    assert d[-4] == np.pi
+    assert d[-3] == np.pi
+
+
+def test_wrap_near_seam_with_many_turns():
+    k = np.arange(-1000, 1000)
+    seam = np.concatenate(
+        [-np.pi + k * 2 * np.pi, np.pi + k * 2 * np.pi], axis=0
+    )
+    az = np.concatenate([seam, np.nextafter(seam, np.inf)])
+    az = np.concatenate([az, np.nextafter(seam, -np.inf)])
+    w = sc.circular.wrap(az)
+    assert np.all(w > -np.pi)
+    assert np.all(w <= np.pi)
+
+
+def test_unwrap_matches_numpy():
+    prng = np.random.Generator(np.random.PCG64(22))
+    truth = np.cumsum(prng.uniform(low=-2.0, high=2.0, size=10000))
+    wrapped = sc.azimuth_range(truth)
+
+    state = sc.circular.init_unwrap()
+    res = sc.circular.unwrap(state=state, azimuth_rad=wrapped)
+    np.testing.assert_allclose(res, np.unwrap(wrapped), atol=1e-9)
+    np.testing.assert_allclose(res - res[0], truth - truth[0], atol=1e-9)
+
+
+def test_unwrap_in_chunks():
+    prng = np.random.Generator(np.random.PCG64(23))
+    truth = np.cumsum(prng.uniform(low=-3.0, high=3.0, size=10000))
+    wrapped = sc.azimuth_range(truth)
+
+    state = sc.circular.init_unwrap()
+    full = sc.circular.unwrap(state=state, azimuth_rad=wrapped)
+
+    state = sc.circular.init_unwrap()
+    out = np.zeros(wrapped.shape)
+    edges = [0, 1, 1, 333, 5000, 9999, 10000]
+    for i in range(len(edges) - 1):
+        sc.circular.unwrap(
+            state=state,
+            azimuth_rad=wrapped[edges[i] : edges[i + 1]],
+            out=out[edges[i] : edges[i + 1]],
+        )
+    np.testing.assert_array_equal(out, full)
+
+
+def test_unwrap_nan_does_not_poison_the_stream():
+    prng = np.random.Generator(np.random.PCG64(24))
+    truth = np.cumsum(prng.uniform(low=-3.0, high=3.0, size=1000))
+    wrapped = sc.azimuth_range(truth)
+    bad = [0, 499, 500, 777]
+    wrapped[bad] = np.nan
+
+    state = sc.circular.init_unwrap()
+    out = np.zeros(wrapped.shape)
+    sc.circular.unwrap(state=state, azimuth_rad=wrapped[:500], out=out[:500])
+    assert state["last_rad"] is not None
+    assert np.isfinite(state["turns"])
+    sc.circular.unwrap(state=state, azimuth_rad=wrapped[500:], out=out[500:])
+    assert np.isfinite(state["turns"])
+
+    good = np.ones(wrapped.shape, dtype=bool)
+    good[bad] = False
+    assert np.all(np.isnan(out[bad]))
+    assert np.all(np.isfinite(out[good]))
+
+    # between the nans the stream is unwrapped
+    for start, stop in [(1, 499), (501, 777), (778, 1000)]:
+        np.testing.assert_allclose(
+            np.diff(out[start:stop]), np.diff(truth[start:stop]), atol=1e-9
+        )
+        steps = np.diff(out[start:stop])
+        assert np.all(np.abs(steps) <= np.pi)
+
+
+def test_mean_and_variance():
+    az = np.array([np.pi - 0.1, -np.pi + 0.1])
+    assert abs(sc.circular.mean(az)) == np.pi
+    np.testing.assert_allclose(
+        sc.circular.variance(az), 1.0 - np.cos(0.1), atol=1e-12
+    )
+
+    assert np.isnan(sc.circular.mean([0.0, np.pi]))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert np.isnan(sc.circular.mean([]))
+        assert np.isnan(sc.circular.variance([]))
+        assert np.all(np.isnan(sc.circular.variance(np.zeros((3, 0)), axis=1)))
+    np.testing.assert_allclose(sc.circular.variance([0.0, np.pi]), 1.0)
+    np.testing.assert_allclose(sc.circular.variance([0.3, 0.3]), 0.0)
+
+    prng = np.random.Generator(np.random.PCG64(24))
+    az = prng.vonmises(mu=3.0, kappa=50.0, size=(4, 10000))
+    out = np.zeros(4)
+    res = sc.circular.mean(az, axis=1, out=out)
+    assert res is out
+    np.testing.assert_allclose(out, 3.0, atol=0.01)
+    var = sc.circular.variance(az, axis=1)
+    assert var.shape == (4,)
+    assert np.all(var < 0.02)
+
+
+def test_rate_of_change():
+    time = np.linspace(0.0, 10.0, 1001)
+    truth = 0.5 * time + 3.0
+    az = sc.azimuth_range(truth)
+
+    rate = sc.circular.rate_of_change(azimuth_rad=az, time=time)
+    assert rate.shape == (1000,)
+    np.testing.assert_allclose(rate, 0.5, atol=1e-9)
@@ -1,5 +1,6 @@
 import spherical_coordinates as sphcors
 import numpy as np
+import tracemalloc
 
 assert_close = np.testing.assert_almost_equal
 
@@ -79,3 +80,96 @@ def test_corsika_minimal_example():
         # IF CORSIKA works as I think it does, this should hold:
         assert_close(cx, sphcors.corsika.ux_to_cx(ux=ux))
         assert_close(cy, sphcors.corsika.vy_to_cy(vy=vy))
+
+
+def make_bunches(prng, size):
+    az, zd = sphcors.random.uniform_az_zd_in_cone(
+        prng=prng,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=np.deg2rad(80),
+        size=size,
+    )
+    cx, cy, cz = sphcors.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    bunches = np.recarray(
+        shape=size,
+        dtype=[
+            ("x", np.float32),
+            ("y", np.float32),
+            ("ux", np.float64),
+            ("vy", np.float64),
+            ("time", np.float32),
+        ],
+    )
+    bunches["x"] = prng.uniform(size=size)
+    bunches["y"] = prng.uniform(size=size)
+    bunches["ux"] = sphcors.corsika.cx_to_ux(cx)
+    bunches["vy"] = sphcors.corsika.cy_to_vy(cy)
+    bunches["time"] = prng.uniform(size=size)
+    return bunches, az, zd
+
+
+def test_bunches_structured_array():
+    prng = np.random.Generator(np.random.PCG64(146))
+    bunches, az, zd = make_bunches(prng=prng, size=1000)
+
+    cx, cy, cz = sphcors.corsika.bunches_to_cx_cy_cz(bunches)
+    ecx, ecy, ecz = sphcors.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    assert_close(cx, ecx)
+    assert_close(cy, ecy)
+    assert_close(cz, ecz)
+
+    baz, bzd = sphcors.corsika.bunches_to_az_zd(bunches)
+    assert_close(baz, sphcors.azimuth_range(az))
+    assert_close(bzd, zd)
+
+    angle = sphcors.corsika.bunches_angle_to_az_zd(
+        bunches, azimuth_rad=0.3, zenith_rad=0.2
+    )
+    assert_close(angle, sphcors.angle_between_az_zd(az, zd, 0.3, 0.2))
+
+
+def test_bunches_block_with_out_columns():
+    prng = np.random.Generator(np.random.PCG64(147))
+    bunches, az, zd = make_bunches(prng=prng, size=1000)
+    block = np.c_[bunches["x"], bunches["ux"], bunches["vy"]]
+
+    result = np.zeros(
+        shape=1000, dtype=[("az", float), ("zd", float), ("angle", float)]
+    )
+    out_az, out_zd = sphcors.corsika.bunches_to_az_zd(
+        block, ux=1, vy=2, out=(result["az"], result["zd"])
+    )
+    assert np.shares_memory(out_az, result)
+    assert_close(result["az"], sphcors.azimuth_range(az))
+    assert_close(result["zd"], zd)
+
+    sphcors.corsika.bunches_angle_to_az_zd(
+        block, azimuth_rad=0.0, zenith_rad=0.0, ux=1, vy=2, out=result["angle"]
+    )
+    assert_close(result["angle"], zd)
+
+
+def test_bunches_allocate_no_full_size_temporaries():
+    prng = np.random.Generator(np.random.PCG64(148))
+    size = 100 * 1000
+    bunches, az, zd = make_bunches(prng=prng, size=size)
+    out = (np.zeros(size), np.zeros(size), np.zeros(size))
+    full_size = size * 8
+
+    tracemalloc.start()
+    sphcors.corsika.bunches_to_cx_cy_cz(bunches, out=out)
+    sphcors.corsika.bunches_to_az_zd(bunches, out=out[0:2])
+    sphcors.corsika.bunches_angle_to_az_zd(
+        bunches, azimuth_rad=0.3, zenith_rad=0.2, out=out[2]
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # only bool masks and a small block of scratch space
+    assert peak < full_size / 2
+
+    assert_close(out[0], sphcors.azimuth_range(az))
+    assert np.all(out[0] > -np.pi)
+    assert np.all(out[0] <= np.pi)
+    assert_close(out[2], sphcors.angle_between_az_zd(az, zd, 0.3, 0.2))
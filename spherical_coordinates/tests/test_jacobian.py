@@ -0,0 +1,133 @@
+import spherical_coordinates as sc
+import numpy as np
+
+
+def draw_az_zd(prng, size):
+    az = prng.uniform(low=-np.pi, high=np.pi, size=size)
+    zd = prng.uniform(low=0.1, high=np.pi - 0.1, size=size)
+    return az, zd
+
+
+def test_az_zd_to_cx_cy_cz_finite_differences():
+    prng = np.random.Generator(np.random.PCG64(11))
+    az, zd = draw_az_zd(prng=prng, size=1000)
+    h = 1e-6
+
+    jac = sc.jacobian.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    assert jac.shape == (1000, 3, 2)
+
+    c_az_p = np.c_[sc.az_zd_to_cx_cy_cz(az + h, zd)]
+    c_az_m = np.c_[sc.az_zd_to_cx_cy_cz(az - h, zd)]
+    c_zd_p = np.c_[sc.az_zd_to_cx_cy_cz(az, zd + h)]
+    c_zd_m = np.c_[sc.az_zd_to_cx_cy_cz(az, zd - h)]
+    np.testing.assert_allclose(
+        jac[:, :, 0], (c_az_p - c_az_m) / (2 * h), atol=1e-8
+    )
+    np.testing.assert_allclose(
+        jac[:, :, 1], (c_zd_p - c_zd_m) / (2 * h), atol=1e-8
+    )
+
+
+def test_cx_cy_cz_to_az_zd_inverts_forward():
+    prng = np.random.Generator(np.random.PCG64(12))
+    az, zd = draw_az_zd(prng=prng, size=1000)
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+
+    fwd = sc.jacobian.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    inv = sc.jacobian.cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz)
+    assert inv.shape == (1000, 2, 3)
+    np.testing.assert_allclose(
+        np.matmul(inv, fwd),
+        np.broadcast_to(np.eye(2), (1000, 2, 2)),
+        atol=1e-9,
+    )
+
+
+def test_zenith_is_nan():
+    jac = sc.jacobian.cx_cy_cz_to_az_zd(
+        cx=[0.0, 0.1], cy=[0.0, 0.0], cz=[1.0, np.sqrt(0.99)]
+    )
+    assert np.all(np.isnan(jac[0]))
+    assert not np.any(np.isnan(jac[1]))
+
+    cov = sc.jacobian.covariance_cx_cy_cz_to_az_zd(
+        cx=[0.0, 0.1],
+        cy=[0.0, 0.0],
+        cz=[1.0, np.sqrt(0.99)],
+        covariance=np.eye(3) * 1e-4,
+    )
+    assert np.all(np.isnan(cov[0]))
+    assert not np.any(np.isnan(cov[1]))
+
+    # scalars
+    jac = sc.jacobian.cx_cy_cz_to_az_zd(cx=0.0, cy=0.0, cz=1.0)
+    assert jac.shape == (2, 3)
+    assert np.all(np.isnan(jac))
+    jac = sc.jacobian.ux_vy_wz_to_phi_theta(ux=-0.1, vy=-0.2, wz=-0.97)
+    assert jac.shape == (2, 3)
+    assert not np.any(np.isnan(jac))
+    cov = sc.jacobian.covariance_cx_cy_cz_to_az_zd(0.1, 0.2, 0.97, np.eye(3))
+    assert cov.shape == (2, 2)
+    assert not np.any(np.isnan(cov))
+
+    # mixed scalars and arrays
+    jac = sc.jacobian.cx_cy_cz_to_az_zd(cx=[0.0, 0.1], cy=0.0, cz=1.0)
+    assert jac.shape == (2, 2, 3)
+    assert np.all(np.isnan(jac[0]))
+    assert not np.any(np.isnan(jac[1, 0]))
+
+    # the forward Jacobian is fine in the zenith
+    jac = sc.jacobian.az_zd_to_cx_cy_cz(azimuth_rad=0.3, zenith_rad=0.0)
+    assert jac.shape == (3, 2)
+    np.testing.assert_allclose(jac[:, 0], [0.0, 0.0, 0.0], atol=1e-12)
+
+
+def test_corsika_conventions():
+    prng = np.random.Generator(np.random.PCG64(13))
+    az, zd = draw_az_zd(prng=prng, size=100)
+    phi, theta = sc.corsika.az_zd_to_phi_theta(azimuth_rad=az, zenith_rad=zd)
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    ux = sc.corsika.cx_to_ux(cx)
+    vy = sc.corsika.cy_to_vy(cy)
+    wz = sc.corsika.cz_to_wz(cz)
+
+    np.testing.assert_allclose(
+        sc.jacobian.phi_theta_to_ux_vy_wz(phi_rad=phi, theta_rad=theta),
+        -sc.jacobian.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd),
+    )
+    np.testing.assert_allclose(
+        sc.jacobian.ux_vy_wz_to_phi_theta(ux=ux, vy=vy, wz=wz),
+        -sc.jacobian.cx_cy_cz_to_az_zd(cx=cx, cy=cy, cz=cz),
+    )
+
+
+def test_transform_covariance():
+    prng = np.random.Generator(np.random.PCG64(14))
+    num = 100
+    az, zd = draw_az_zd(prng=prng, size=num)
+    a = prng.normal(size=(num, 2, 2)) * 1e-3
+    cov = np.matmul(a, np.swapaxes(a, -1, -2))
+
+    out = np.zeros(shape=(num, 3, 3))
+    cov_c = sc.jacobian.covariance_az_zd_to_cx_cy_cz(
+        azimuth_rad=az, zenith_rad=zd, covariance=cov
+    )
+    jac = sc.jacobian.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    res = sc.jacobian.transform_covariance(
+        jacobian=jac, covariance=cov, out=out
+    )
+    assert res is out
+    for i in range(num):
+        np.testing.assert_allclose(out[i], jac[i] @ cov[i] @ jac[i].T)
+    np.testing.assert_allclose(out, cov_c)
+
+    # and back
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    cov_back = sc.jacobian.covariance_cx_cy_cz_to_az_zd(
+        cx=cx, cy=cy, cz=cz, covariance=cov_c
+    )
+    np.testing.assert_allclose(cov_back, cov, rtol=1e-6, atol=1e-15)
+
+    # one covariance for all
+    res = sc.jacobian.transform_covariance(jacobian=jac, covariance=np.eye(2))
+    assert res.shape == (num, 3, 3)
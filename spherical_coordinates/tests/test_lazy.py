@@ -0,0 +1,96 @@
+import spherical_coordinates as sc
+import numpy as np
+
+
+def test_chain_of_corsika_bunches():
+    prng = np.random.Generator(np.random.PCG64(148))
+    NUM = 100 * 1000
+    az, zd = sc.random.uniform_az_zd_in_cone(
+        prng=prng,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=np.deg2rad(60),
+        size=NUM,
+    )
+    cx, cy = sc.az_zd_to_cx_cy(azimuth_rad=az, zenith_rad=zd)
+    ux = sc.corsika.cx_to_ux(cx)
+    vy = sc.corsika.cy_to_vy(cy)
+
+    # eager
+    e_az, e_zd = sc.cx_cy_to_az_zd(
+        cx=sc.corsika.ux_to_cx(ux), cy=sc.corsika.vy_to_cy(vy)
+    )
+    e_az = sc.azimuth_range(e_az)
+    e_angle = sc.angle_between_az_zd(e_az, e_zd, 0.1, 0.2)
+    e_mask = e_angle < np.deg2rad(30)
+
+    # lazy
+    L = sc.lazy
+    l_cx = L.call(sc.corsika.ux_to_cx, L.variable("ux"))
+    l_cy = L.call(sc.corsika.vy_to_cy, L.variable("vy"))
+    l_az, l_zd = L.call(sc.cx_cy_to_az_zd, l_cx, l_cy, num_outputs=2)
+    l_az = L.call(sc.azimuth_range, l_az)
+    l_angle = L.call(sc.angle_between_az_zd, l_az, l_zd, 0.1, 0.2)
+    l_mask = L.call(np.less, l_angle, np.deg2rad(30))
+
+    angle, mask = L.evaluate(
+        outputs=[l_angle, l_mask],
+        inputs={"ux": ux, "vy": vy},
+        chunk_size=1000,
+    )
+    np.testing.assert_array_almost_equal(angle, e_angle)
+    assert mask.dtype == bool
+    np.testing.assert_array_equal(mask, e_mask)
+
+    single = L.evaluate(outputs=l_mask, inputs={"ux": ux, "vy": vy})
+    np.testing.assert_array_equal(single, e_mask)
+
+
+def test_round_trips_are_removed():
+    L = sc.lazy
+    ux = L.variable("ux")
+    assert L.call(sc.corsika.cx_to_ux, L.call(sc.corsika.ux_to_cx, ux)) is ux
+
+    az = L.variable("az")
+    zd = L.variable("zd")
+    cx, cy, cz = L.call(sc.az_zd_to_cx_cy_cz, az, zd, num_outputs=3)
+    az_back, zd_back = L.call(sc.cx_cy_cz_to_az_zd, cx, cy, cz, num_outputs=2)
+    assert zd_back is zd
+    assert az_back["func"] is sc.azimuth_range
+    assert az_back["args"][0] is az
+
+    cx_back, cy_back, cz_back = L.call(
+        sc.az_zd_to_cx_cy_cz, az_back, zd_back, num_outputs=3
+    )
+    assert cx_back["node"]["args"][0] is az_back
+
+    azr = L.call(sc.azimuth_range, az)
+    assert L.call(sc.azimuth_range, azr) is azr
+
+    a = np.linspace(-7, 7, 101)
+    z = np.linspace(0, np.pi, 101)
+    res = L.evaluate(
+        outputs=[az_back, zd_back, cz_back], inputs={"az": a, "zd": z}
+    )
+    np.testing.assert_array_almost_equal(res[0], sc.azimuth_range(a))
+    np.testing.assert_array_equal(res[1], z)
+    np.testing.assert_array_almost_equal(res[2], np.cos(z))
+
+
+def test_each_node_is_evaluated_once_per_chunk():
+    calls = []
+
+    def count(x):
+        calls.append(len(x))
+        return 2 * x
+
+    L = sc.lazy
+    x = L.variable("x")
+    y = L.call(count, x)
+    a = L.call(np.add, y, 1.0)
+    b = L.call(np.add, y, 2.0)
+    ra, rb = L.evaluate(outputs=[a, b], inputs={"x": np.arange(10.0)})
+    np.testing.assert_array_equal(ra, 2 * np.arange(10.0) + 1)
+    np.testing.assert_array_equal(rb, 2 * np.arange(10.0) + 2)
+    assert calls == [10]
@@ -0,0 +1,97 @@
+import spherical_coordinates as sc
+import numpy as np
+import pytest
+
+
+def test_scalars():
+    f = sc.memo.memoize(sc.az_zd_to_cx_cy_cz, maxsize=2)
+    a = f(azimuth_rad=0.1, zenith_rad=0.2)
+    b = f(azimuth_rad=0.1, zenith_rad=0.2)
+    assert a == b
+    assert a == sc.az_zd_to_cx_cy_cz(azimuth_rad=0.1, zenith_rad=0.2)
+    assert f.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    # exact keys
+    f(azimuth_rad=0.1 + 1e-15, zenith_rad=0.2)
+    assert f.cache_info()["misses"] == 2
+
+    # least recently used is evicted
+    f(azimuth_rad=0.3, zenith_rad=0.2)
+    assert f.cache_info()["size"] == 2
+    f(azimuth_rad=0.1, zenith_rad=0.2)
+    assert f.cache_info()["misses"] == 4
+
+    f.cache_clear()
+    assert f.cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+
+
+def test_arrays_are_read_only():
+    f = sc.memo.memoize(sc.az_zd_to_cx_cy_cz)
+    az = np.linspace(-1, 1, 10)
+    zd = np.linspace(0, 1, 10)
+    cx, cy, cz = f(az, zd)
+    cx2, _, _ = f(az.copy(), zd.copy())
+    assert cx2 is cx
+    assert f.cache_info()["hits"] == 1
+    with pytest.raises(ValueError):
+        cx[0] = 1.0
+
+    # different content, different key
+    az[0] = 0.5
+    f(az, zd)
+    assert f.cache_info()["misses"] == 2
+
+    f.cache_invalidate(az, zd)
+    f(az, zd)
+    assert f.cache_info()["misses"] == 3
+
+
+def test_positional_and_keyword_arguments_share_key():
+    f = sc.memo.memoize(sc.restore_cz)
+    f(0.1, 0.2)
+    f(cx=0.1, cy=0.2)
+    f(0.1, cy=0.2, eps=1e-6)
+    assert f.cache_info()["size"] == 1
+    assert f.cache_info()["hits"] == 2
+
+    f.cache_invalidate(cy=0.2, cx=0.1)
+    assert f.cache_info()["size"] == 0
+
+
+def test_large_arrays_bypass():
+    f = sc.memo.memoize(sc.azimuth_range, max_array_size=10)
+    res = f(np.zeros(11))
+    f(np.zeros(11))
+    assert f.cache_info()["size"] == 0
+    assert f.cache_info()["misses"] == 2
+    # not owned by the cache, so not read only
+    assert res.flags.writeable
+
+
+def test_prepared_functions():
+    rot = sc.memo.rotation_matrix_az_zd(azimuth_rad=0.2, zenith_rad=0.3)
+    assert not rot.flags.writeable
+    np.testing.assert_array_almost_equal(
+        rot[:, 2], sc.az_zd_to_cx_cy_cz(azimuth_rad=0.2, zenith_rad=0.3)
+    )
+    az, zd = sc.memo.cx_cy_cz_to_az_zd(cx=0.0, cy=0.0, cz=1.0)
+    assert zd == 0.0
+
+
+def test_sampler_with_memoized_rotation():
+    kwargs = dict(
+        azimuth_rad=0.2,
+        zenith_rad=0.3,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=0.1,
+        size=10,
+    )
+    a = sc.random.uniform_cx_cy_cz_in_cone(
+        prng=np.random.Generator(np.random.PCG64(1)), **kwargs
+    )
+    b = sc.random.uniform_cx_cy_cz_in_cone(
+        prng=np.random.Generator(np.random.PCG64(1)),
+        rotation_matrix_az_zd=sc.memo.rotation_matrix_az_zd,
+        **kwargs,
+    )
+    np.testing.assert_array_equal(a, b)
@@ -0,0 +1,82 @@
+import spherical_coordinates as sc
+import numpy as np
+
+
+def angle_between(a, b):
+    cross = np.cross(a, b)
+    return np.arctan2(np.linalg.norm(cross, axis=1), np.sum(a * b, axis=1))
+
+
+def test_round_trip_error():
+    prng = np.random.Generator(np.random.PCG64(151))
+    cx, cy, cz = sc.random.uniform_cx_cy_cz_in_cone(
+        prng=prng,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=np.pi,
+        size=100 * 1000,
+    )
+    # the poles, the equator, and the centers of the faces
+    special = np.array(
+        [[0, 0, 1], [0, 0, -1], [1, 0, 0], [0, -1, 0], [1, 1, 1], [1, -1, -1]],
+        dtype=float,
+    )
+    special /= np.linalg.norm(special, axis=1)[:, np.newaxis]
+    cx = np.concatenate([cx, special[:, 0]])
+    cy = np.concatenate([cy, special[:, 1]])
+    cz = np.concatenate([cz, special[:, 2]])
+
+    for bits_per_axis in sc.octahedral.MAX_ANGLE_ERROR_RAD:
+        code = sc.octahedral.cx_cy_cz_to_code(
+            cx, cy, cz, bits_per_axis=bits_per_axis
+        )
+        assert code.dtype == (np.uint32 if bits_per_axis == 16 else np.uint64)
+        bcx, bcy, bcz = sc.octahedral.code_to_cx_cy_cz(
+            code, bits_per_axis=bits_per_axis
+        )
+        np.testing.assert_array_almost_equal(
+            bcx**2 + bcy**2 + bcz**2, np.ones(len(cx))
+        )
+        delta = angle_between(np.c_[cx, cy, cz], np.c_[bcx, bcy, bcz])
+        assert (
+            np.max(delta) <= sc.octahedral.MAX_ANGLE_ERROR_RAD[bits_per_axis]
+        )
+
+
+def test_az_zd():
+    az = np.linspace(-np.pi, np.pi, 101)
+    zd = np.linspace(0.1, np.pi - 0.1, 101)
+    code = sc.octahedral.az_zd_to_code(azimuth_rad=az, zenith_rad=zd)
+    baz, bzd = sc.octahedral.code_to_az_zd(code)
+    delta = sc.angle_between_az_zd(az, zd, baz, bzd)
+    assert np.max(delta) <= sc.octahedral.MAX_ANGLE_ERROR_RAD[16]
+
+
+def test_chunked_memmap(tmp_path):
+    prng = np.random.Generator(np.random.PCG64(152))
+    NUM = 10 * 1000
+    cx, cy, cz = sc.random.uniform_cx_cy_cz_in_cone(
+        prng=prng,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=np.pi,
+        size=NUM,
+    )
+    path = str(tmp_path / "directions.u32")
+    codes = np.memmap(path, dtype=np.uint32, mode="w+", shape=(NUM,))
+    for start in range(0, NUM, 3000):
+        s = slice(start, start + 3000)
+        sc.octahedral.cx_cy_cz_to_code(cx[s], cy[s], cz[s], out=codes[s])
+    codes.flush()
+    del codes
+    assert (tmp_path / "directions.u32").stat().st_size == 4 * NUM
+
+    codes = np.memmap(path, dtype=np.uint32, mode="r", shape=(NUM,))
+    bcx, bcy, bcz = np.zeros(NUM), np.zeros(NUM), np.zeros(NUM)
+    for start in range(0, NUM, 3000):
+        s = slice(start, start + 3000)
+        sc.octahedral.code_to_cx_cy_cz(codes[s], out=(bcx[s], bcy[s], bcz[s]))
+    delta = angle_between(np.c_[cx, cy, cz], np.c_[bcx, bcy, bcz])
+    assert np.max(delta) <= sc.octahedral.MAX_ANGLE_ERROR_RAD[16]
@@ -0,0 +1,215 @@
+import spherical_coordinates as sc
+import numpy as np
+import os
+import pytest
+
+
+def _list_shared_memory():
+    if os.path.isdir("/dev/shm"):
+        return set(os.listdir("/dev/shm"))
+    return set()
+
+
+def _fail(azimuth_rad):
+    raise ValueError("expected failure")
+
+
+def test_apply():
+    prng = np.random.Generator(np.random.PCG64(144))
+    NUM = 10 * 1000
+    az = prng.uniform(low=-4, high=4, size=NUM)
+    zd = prng.uniform(low=0, high=np.pi, size=NUM)
+
+    cx, cy, cz = sc.parallel.apply(
+        func=sc.az_zd_to_cx_cy_cz,
+        arrays={"azimuth_rad": az, "zenith_rad": zd},
+        num_outputs=3,
+        num_processes=2,
+        chunk_size=1000,
+    )
+    ecx, ecy, ecz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+    np.testing.assert_array_equal(cx, ecx)
+    np.testing.assert_array_equal(cy, ecy)
+    np.testing.assert_array_equal(cz, ecz)
+
+    delta = sc.parallel.apply(
+        func=sc.angle_between_az_zd,
+        arrays={"azimuth1_rad": az, "zenith1_rad": zd},
+        kwargs={"azimuth2_rad": 0.0, "zenith2_rad": 0.0},
+        num_processes=2,
+        chunk_size=3333,
+    )
+    np.testing.assert_array_almost_equal(delta, zd)
+
+
+def test_output_dtypes():
+    az = np.linspace(-np.pi, np.pi, 100)
+    zd = np.linspace(0.0, 1.0, 100)
+    box = {
+        "azimuth_start_rad": -1.0,
+        "azimuth_stop_rad": 1.0,
+        "zenith_start_rad": 0.0,
+        "zenith_stop_rad": 0.5,
+    }
+    inside = sc.parallel.apply(
+        func=sc.is_az_zd_in_box,
+        arrays={"azimuth_rad": az, "zenith_rad": zd},
+        kwargs=box,
+        num_processes=2,
+        chunk_size=30,
+        output_dtypes=[bool],
+    )
+    assert inside.dtype == bool
+    np.testing.assert_array_equal(
+        inside, sc.is_az_zd_in_box(azimuth_rad=az, zenith_rad=zd, **box)
+    )
+
+    # float64 does not fit into bool
+    with pytest.raises(AssertionError):
+        sc.parallel.apply(
+            func=sc.azimuth_range,
+            arrays={"azimuth_rad": az},
+            num_processes=2,
+            output_dtypes=[bool],
+        )
+
+
+def test_sample():
+    kwargs = {
+        "azimuth_rad": 1.0,
+        "zenith_rad": 0.5,
+        "min_half_angle_rad": 0.0,
+        "max_half_angle_rad": 0.1,
+    }
+    az, zd = sc.parallel.sample(
+        func=sc.random.uniform_az_zd_in_cone,
+        size=5000,
+        seed=145,
+        kwargs=kwargs,
+        num_processes=2,
+        chunk_size=1000,
+    )
+    assert az.shape == (5000,)
+    delta = sc.angle_between_az_zd(az, zd, 1.0, 0.5)
+    assert np.all(delta <= 0.1 + 1e-9)
+
+    az_again, zd_again = sc.parallel.sample(
+        func=sc.random.uniform_az_zd_in_cone,
+        size=5000,
+        seed=145,
+        kwargs=kwargs,
+        num_processes=3,
+        chunk_size=1000,
+    )
+    np.testing.assert_array_equal(az, az_again)
+    np.testing.assert_array_equal(zd, zd_again)
+
+
+def test_empty():
+    cx = sc.parallel.apply(
+        func=sc.azimuth_range,
+        arrays={"azimuth_rad": np.zeros(0)},
+        num_processes=1,
+    )
+    assert cx.shape == (0,)
+
+
+def test_shared_memory_is_unlinked_on_error():
+    before = _list_shared_memory()
+    with pytest.raises(ValueError):
+        sc.parallel.apply(
+            func=_fail,
+            arrays={"azimuth_rad": np.zeros(100)},
+            num_processes=2,
+            chunk_size=10,
+        )
+    assert _list_shared_memory() == before
+
+
+def test_executor_keeps_arrays_in_shared_memory():
+    prng = np.random.Generator(np.random.PCG64(146))
+    NUM = 10 * 1000
+    before = _list_shared_memory()
+
+    with sc.parallel.Executor(num_processes=2) as executor:
+        az = executor.empty(size=NUM)
+        zd = executor.empty(size=NUM)
+        az[:] = prng.uniform(low=-4, high=4, size=NUM)
+        zd[:] = prng.uniform(low=0, high=np.pi, size=NUM)
+        assert executor._find_block(x=az) is not None
+
+        out = tuple([executor.empty(size=NUM) for i in range(3)])
+        cx, cy, cz = executor.apply(
+            func=sc.az_zd_to_cx_cy_cz,
+            arrays={"azimuth_rad": az, "zenith_rad": zd},
+            num_outputs=3,
+            chunk_size=1000,
+            out=out,
+        )
+        assert cx is out[0]
+        ecx, ecy, ecz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+        np.testing.assert_array_equal(cx, ecx)
+        np.testing.assert_array_equal(cy, ecy)
+        np.testing.assert_array_equal(cz, ecz)
+
+        # slices of shared arrays and out which is not in shared memory
+        delta = np.zeros(NUM // 2)
+        res = executor.apply(
+            func=sc.angle_between_az_zd,
+            arrays={"azimuth1_rad": az[NUM // 2 :], "zenith1_rad": zd[1::2]},
+            kwargs={"azimuth2_rad": 0.0, "zenith2_rad": 0.0},
+            chunk_size=333,
+            out=delta,
+        )
+        assert res is delta
+        np.testing.assert_array_almost_equal(delta, zd[1::2])
+
+        # the pool survives errors
+        with pytest.raises(ValueError):
+            executor.apply(func=_fail, arrays={"azimuth_rad": az})
+        inside = executor.apply(
+            func=sc.is_az_zd_in_box,
+            arrays={"azimuth_rad": az, "zenith_rad": zd},
+            kwargs={
+                "azimuth_start_rad": -1.0,
+                "azimuth_stop_rad": 1.0,
+                "zenith_start_rad": 0.0,
+                "zenith_stop_rad": 0.5,
+            },
+            out=executor.empty(size=NUM, dtype=bool),
+        )
+        assert inside.dtype == bool
+
+    assert _list_shared_memory() == before
+    with pytest.raises(AssertionError):
+        executor.empty(size=1)
+
+
+def test_executor_sample_matches_sample():
+    kwargs = {
+        "azimuth_rad": 1.0,
+        "zenith_rad": 0.5,
+        "min_half_angle_rad": 0.0,
+        "max_half_angle_rad": 0.1,
+    }
+    az, zd = sc.parallel.sample(
+        func=sc.random.uniform_az_zd_in_cone,
+        size=5000,
+        seed=147,
+        kwargs=kwargs,
+        num_processes=2,
+        chunk_size=1000,
+    )
+    with sc.parallel.Executor(num_processes=2) as executor:
+        out = (executor.empty(size=5000), executor.empty(size=5000))
+        for i in range(3):
+            executor.sample(
+                func=sc.random.uniform_az_zd_in_cone,
+                size=5000,
+                seed=147,
+                kwargs=kwargs,
+                chunk_size=1000,
+                out=out,
+            )
+            np.testing.assert_array_equal(out[0], az)
+            np.testing.assert_array_equal(out[1], zd)
@@ -0,0 +1,79 @@
+import spherical_coordinates as sc
+import numpy as np
+import warnings
+
+RADIUS_OF_THETA = {
+    "gnomonic": lambda theta: np.tan(theta),
+    "stereographic": lambda theta: 2.0 * np.tan(theta / 2.0),
+    "orthographic": lambda theta: np.sin(theta),
+}
+
+
+def test_pointing_is_origin():
+    for az, zd in [(0.0, 0.0), (1.0, 0.5), (-2.0, 2.0)]:
+        plane = sc.projection.init_tangent_plane(azimuth_rad=az, zenith_rad=zd)
+        cx, cy, cz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+        for projection in sc.projection.PROJECTIONS:
+            x, y = sc.projection.cx_cy_cz_to_x_y(
+                plane, cx, cy, cz, projection=projection
+            )
+            assert isinstance(x, float)
+            np.testing.assert_almost_equal(x, 0.0)
+            np.testing.assert_almost_equal(y, 0.0)
+
+
+def test_round_trip_and_radius():
+    prng = np.random.Generator(np.random.PCG64(149))
+    for az, zd in [(0.0, 0.0), (1.0, 0.5), (-2.0, 2.0)]:
+        plane = sc.projection.init_tangent_plane(azimuth_rad=az, zenith_rad=zd)
+        cx, cy, cz = sc.random.uniform_cx_cy_cz_in_cone(
+            prng=prng,
+            azimuth_rad=az,
+            zenith_rad=zd,
+            min_half_angle_rad=0.0,
+            max_half_angle_rad=1.2,
+            size=1000,
+        )
+        theta = sc.angle_between_cx_cy_cz(
+            cx, cy, cz, *sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+        )
+        for projection in sc.projection.PROJECTIONS:
+            out = (np.zeros(1000), np.zeros(1000))
+            x, y = sc.projection.cx_cy_cz_to_x_y(
+                plane, cx, cy, cz, projection=projection, out=out
+            )
+            assert x is out[0]
+            np.testing.assert_array_almost_equal(
+                np.hypot(x, y), RADIUS_OF_THETA[projection](theta)
+            )
+
+            bcx, bcy, bcz = sc.projection.x_y_to_cx_cy_cz(
+                plane, x, y, projection=projection
+            )
+            np.testing.assert_array_almost_equal(bcx, cx)
+            np.testing.assert_array_almost_equal(bcy, cy)
+            np.testing.assert_array_almost_equal(bcz, cz)
+
+
+def test_back_side():
+    plane = sc.projection.init_tangent_plane(azimuth_rad=0.0, zenith_rad=0.0)
+    cx, cy, cz = (
+        np.array([0.6, 0.0]),
+        np.array([0.0, 0.0]),
+        np.array([-0.8, -1.0]),
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        x, y = sc.projection.cx_cy_cz_to_x_y(plane, cx, cy, cz, "gnomonic")
+        assert np.all(np.isnan(x))
+        x, y = sc.projection.cx_cy_cz_to_x_y(plane, cx, cy, cz, "orthographic")
+        assert np.all(np.isnan(x))
+        x, y = sc.projection.cx_cy_cz_to_x_y(
+            plane, cx, cy, cz, "stereographic"
+        )
+        np.testing.assert_almost_equal(x[0], 6.0)
+        assert np.isnan(x[1])
+
+        x, y = np.array([0.0, 2.0]), np.array([0.0, 0.0])
+        cx, cy, cz = sc.projection.x_y_to_cx_cy_cz(plane, x, y, "orthographic")
+        assert np.isnan(cz[1])
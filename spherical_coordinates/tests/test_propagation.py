@@ -0,0 +1,156 @@
+import spherical_coordinates as sc
+import numpy as np
+
+
+def draw_photons(prng, size):
+    cx, cy, cz = sc.random.uniform_cx_cy_cz_in_cone(
+        prng=prng,
+        azimuth_rad=0.3,
+        zenith_rad=0.4,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=0.3,
+        size=size,
+    )
+    x = prng.uniform(low=-100, high=100, size=size)
+    y = prng.uniform(low=-100, high=100, size=size)
+    z = prng.uniform(low=1000, high=2000, size=size)
+    return x, y, z, cx, cy, cz
+
+
+def test_horizontal_plane():
+    prng = np.random.Generator(np.random.PCG64(153))
+    x, y, z, cx, cy, cz = draw_photons(prng=prng, size=1000)
+
+    px, py = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=z, cx=cx, cy=cy, plane_z=500.0
+    )
+    # the intersections are on the line of the photon
+    t = (z - 500.0) / cz
+    np.testing.assert_array_almost_equal(px, x - t * cx)
+    np.testing.assert_array_almost_equal(py, y - t * cy)
+
+    # a photon moving into positive x (ux > 0) lands at larger x
+    assert np.all((px > x) == (sc.corsika.cx_to_ux(cx) > 0))
+
+    out = (np.zeros(1000), np.zeros(1000))
+    res = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=z, cx=cx, cy=cy, cz=cz, plane_z=500.0, out=out
+    )
+    assert res[0] is out[0]
+    np.testing.assert_array_almost_equal(out[0], px)
+
+
+def test_horizontal_plane_parallel():
+    px, py = sc.propagation.to_horizontal_plane(
+        x=[0.0, 0.0],
+        y=[0.0, 0.0],
+        z=10.0,
+        cx=[1.0, 0.0],
+        cy=[0.0, 0.0],
+        plane_z=0.0,
+    )
+    assert np.isnan(px[0])
+    np.testing.assert_array_almost_equal([px[1], py[1]], [0.0, 0.0])
+
+
+def test_plane_of_pointing():
+    prng = np.random.Generator(np.random.PCG64(154))
+    x, y, z, cx, cy, cz = draw_photons(prng=prng, size=1000)
+
+    # the plane of the zenith is the horizontal plane
+    u, v = sc.propagation.to_plane_of_pointing(
+        x=x,
+        y=y,
+        z=z,
+        cx=cx,
+        cy=cy,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        support=(0.0, 0.0, 500.0),
+    )
+    px, py = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=z, cx=cx, cy=cy, plane_z=500.0
+    )
+    np.testing.assert_array_almost_equal(u, px)
+    np.testing.assert_array_almost_equal(v, py)
+
+    # tilted plane
+    support = np.array([10.0, -20.0, 100.0])
+    u, v = sc.propagation.to_plane_of_pointing(
+        x=x,
+        y=y,
+        z=z,
+        cx=cx,
+        cy=cy,
+        azimuth_rad=0.3,
+        zenith_rad=0.4,
+        support=support,
+    )
+    plane = sc.projection.init_tangent_plane(azimuth_rad=0.3, zenith_rad=0.4)
+    pos = (
+        support[:, np.newaxis]
+        + np.outer(plane["ex"], u)
+        + np.outer(plane["ey"], v)
+    )
+    # the point on the plane is on the line of the photon
+    delta = pos - np.array([x, y, z])
+    cross = np.cross(delta.T, np.c_[cx, cy, cz])
+    np.testing.assert_array_almost_equal(
+        np.linalg.norm(cross, axis=1) / np.linalg.norm(delta, axis=0),
+        np.zeros(1000),
+    )
+
+
+def test_photons_running_away_from_the_plane():
+    # a downgoing photon (cz > 0) above and below the plane
+    kwargs = dict(
+        x=[0.0, 0.0], y=[0.0, 0.0], z=[10.0, -10.0], cx=[0.1, 0.1], cy=[0, 0]
+    )
+    px, py = sc.propagation.to_horizontal_plane(plane_z=0.0, **kwargs)
+    assert not np.isnan(px[0])
+    assert np.isnan(px[1])
+
+    px, py = sc.propagation.to_horizontal_plane(
+        plane_z=0.0, backwards=True, **kwargs
+    )
+    assert not np.any(np.isnan(px))
+    np.testing.assert_array_almost_equal(px, [-px[1], -px[0]])
+
+    u, v = sc.propagation.to_plane_of_pointing(
+        azimuth_rad=0.0, zenith_rad=0.0, **kwargs
+    )
+    assert not np.isnan(u[0])
+    assert np.isnan(u[1])
+
+
+def test_scalar_direction():
+    # a bunch of photons sharing one direction
+    x = np.array([0.0, 1.0])
+    y = np.array([0.0, 0.0])
+    px, py = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=10.0, cx=0.1, cy=0.0, plane_z=0.0
+    )
+    epx, epy = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=10.0, cx=[0.1, 0.1], cy=[0.0, 0.0], plane_z=0.0
+    )
+    assert not np.any(np.isnan(px))
+    np.testing.assert_array_almost_equal(px, epx)
+    np.testing.assert_array_almost_equal(py, epy)
+
+    cz = np.sqrt(1.0 - 0.1**2)
+    px, py = sc.propagation.to_horizontal_plane(
+        x=x, y=y, z=10.0, cx=0.1, cy=0.0, cz=cz, plane_z=0.0
+    )
+    np.testing.assert_array_almost_equal(px, epx)
+
+    u, v = sc.propagation.to_plane_of_pointing(
+        x=x,
+        y=y,
+        z=10.0,
+        cx=0.1,
+        cy=0.0,
+        cz=cz,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+    )
+    np.testing.assert_array_almost_equal(u, epx)
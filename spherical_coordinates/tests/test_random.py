@@ -1,5 +1,6 @@
 import spherical_coordinates as sc
 import numpy as np
+import pytest
 
 
 def example_cone_orientations():
@@ -107,3 +108,380 @@ def test_cone():
         )
 
         assert delta_rad < eps_rad
+
+
+def test_cx_cy_cz_in_cone_same_as_az_zd():
+    for cone in example_cone_orientations():
+        for size in [None, 0, 1, 1000]:
+            prng = np.random.Generator(np.random.PCG64(134))
+            az, zd = sc.random.uniform_az_zd_in_cone(
+                prng=prng,
+                azimuth_rad=cone["azimuth_rad"],
+                zenith_rad=cone["zenith_rad"],
+                min_half_angle_rad=0.1,
+                max_half_angle_rad=0.5,
+                size=size,
+            )
+            prng = np.random.Generator(np.random.PCG64(134))
+            cx, cy, cz = sc.random.uniform_cx_cy_cz_in_cone(
+                prng=prng,
+                azimuth_rad=cone["azimuth_rad"],
+                zenith_rad=cone["zenith_rad"],
+                min_half_angle_rad=0.1,
+                max_half_angle_rad=0.5,
+                size=size,
+            )
+            assert np.shape(cx) == np.shape(az)
+            assert np.shape(cz) == np.shape(zd)
+
+            ecx, ecy, ecz = sc.az_zd_to_cx_cy_cz(azimuth_rad=az, zenith_rad=zd)
+            np.testing.assert_array_almost_equal(cx, ecx)
+            np.testing.assert_array_almost_equal(cy, ecy)
+            np.testing.assert_array_almost_equal(cz, ecz)
+
+
+def test_alias_table():
+    prng = np.random.Generator(np.random.PCG64(135))
+    weights = np.array([0.0, 1.0, 2.0, 0.0, 5.0, 0.5, 1.5])
+    alias_table = sc.random.init_alias_table(weights=weights)
+
+    index = sc.random.draw_from_alias_table(prng=prng, alias_table=alias_table)
+    assert isinstance(index, int)
+
+    NUM = 1000 * 1000
+    index = sc.random.draw_from_alias_table(
+        prng=prng, alias_table=alias_table, size=NUM
+    )
+    counts = np.bincount(index, minlength=len(weights))
+    np.testing.assert_array_almost_equal(
+        counts / NUM, weights / np.sum(weights), decimal=2
+    )
+    assert counts[0] == 0
+    assert counts[3] == 0
+
+
+def test_sky_map():
+    prng = np.random.Generator(np.random.PCG64(136))
+    az_edges = np.linspace(-np.pi, np.pi, 5)
+    zd_edges = np.linspace(0.0, np.pi / 2, 4)
+    weights = np.zeros(shape=(4, 3))
+    weights[1, 2] = 1.0
+    weights[3, 0] = 3.0
+
+    sky_map = sc.random.init_sky_map(
+        azimuth_bin_edges_rad=az_edges,
+        zenith_bin_edges_rad=zd_edges,
+        weights=weights,
+    )
+
+    az, zd = sc.random.az_zd_from_sky_map(prng=prng, sky_map=sky_map)
+    assert np.shape(az) == ()
+    assert np.shape(zd) == ()
+
+    NUM = 100 * 1000
+    az, zd = sc.random.az_zd_from_sky_map(prng=prng, sky_map=sky_map, size=NUM)
+    assert np.shape(az) == (NUM,)
+
+    in_cell_1_2 = np.logical_and(
+        np.logical_and(az_edges[1] <= az, az < az_edges[2]),
+        np.logical_and(zd_edges[2] <= zd, zd <= zd_edges[3]),
+    )
+    in_cell_3_0 = np.logical_and(
+        np.logical_and(az_edges[3] <= az, az <= az_edges[4]),
+        np.logical_and(zd_edges[0] <= zd, zd < zd_edges[1]),
+    )
+    assert np.all(np.logical_or(in_cell_1_2, in_cell_3_0))
+    np.testing.assert_almost_equal(np.mean(in_cell_1_2), 0.25, decimal=2)
+
+    # uniform w.r.t. solid angle within the cell
+    cos_zd = np.cos(zd[in_cell_3_0])
+    np.testing.assert_almost_equal(
+        np.median(cos_zd), np.mean(np.cos(zd_edges[0:2])), decimal=2
+    )
+
+
+def test_quasi_random_unit_square():
+    index = np.arange(8, dtype=np.uint64)
+    np.testing.assert_array_almost_equal(
+        sc.random._radical_inverse(index=index[0:5], base=3),
+        [0.0, 1 / 3, 2 / 3, 1 / 9, 4 / 9],
+    )
+    rd1, rd2 = sc.random._sobol_2d(index=index)
+    np.testing.assert_array_almost_equal(
+        rd1, [0.0, 0.5, 0.25, 0.75, 0.125, 0.625, 0.375, 0.875]
+    )
+    np.testing.assert_array_almost_equal(
+        rd2, [0.0, 0.5, 0.75, 0.25, 0.625, 0.125, 0.375, 0.875]
+    )
+
+
+def test_sobol_limit_of_32_bits():
+    cone = {
+        "azimuth_rad": 0.0,
+        "zenith_rad": 0.0,
+        "min_half_angle_rad": 0.0,
+        "max_half_angle_rad": 0.5,
+    }
+    az, zd = sc.random.sobol_az_zd_in_cone(size=2, start=2**32 - 2, **cone)
+    assert np.all(np.isfinite(az))
+    assert np.all(np.isfinite(zd))
+    with pytest.raises(AssertionError):
+        sc.random.sobol_az_zd_in_cone(size=3, start=2**32 - 2, **cone)
+    with pytest.raises(AssertionError):
+        sc.random._sobol_2d(index=[2**32])
+
+
+def test_quasi_random_in_cone():
+    quasi_random_functions = [
+        sc.random.halton_az_zd_in_cone,
+        sc.random.sobol_az_zd_in_cone,
+        sc.random.fibonacci_az_zd_in_cone,
+    ]
+    for func in quasi_random_functions:
+        for cone in example_cone_orientations():
+            az, zd = func(
+                azimuth_rad=cone["azimuth_rad"],
+                zenith_rad=cone["zenith_rad"],
+                min_half_angle_rad=0.0,
+                max_half_angle_rad=np.deg2rad(10.0),
+                size=1024,
+            )
+            assert np.shape(az) == (1024,)
+            delta = sc.angle_between_az_zd(
+                azimuth1_rad=az,
+                zenith1_rad=zd,
+                azimuth2_rad=cone["azimuth_rad"],
+                zenith2_rad=cone["zenith_rad"],
+            )
+            assert np.all(delta <= np.deg2rad(10.0) + 1e-9)
+
+
+def test_quasi_random_continuation():
+    for func in [
+        sc.random.halton_az_zd_in_cone,
+        sc.random.sobol_az_zd_in_cone,
+    ]:
+        cone = {
+            "azimuth_rad": 1.0,
+            "zenith_rad": 0.5,
+            "min_half_angle_rad": 0.1,
+            "max_half_angle_rad": 0.6,
+        }
+        az, zd = func(
+            size=100, prng=np.random.Generator(np.random.PCG64(137)), **cone
+        )
+        az1, zd1 = func(
+            size=40, prng=np.random.Generator(np.random.PCG64(137)), **cone
+        )
+        az2, zd2 = func(
+            size=60,
+            start=40,
+            prng=np.random.Generator(np.random.PCG64(137)),
+            **cone
+        )
+        np.testing.assert_array_equal(az, np.concatenate([az1, az2]))
+        np.testing.assert_array_equal(zd, np.concatenate([zd1, zd2]))
+
+
+def test_quasi_random_converges_faster_than_pseudo_random():
+    # The expectation of cos(zd) on the full sphere is zero.
+    NUM = 4096
+    prng = np.random.Generator(np.random.PCG64(138))
+    cone = {
+        "azimuth_rad": 0.3,
+        "zenith_rad": 0.7,
+        "min_half_angle_rad": 0.0,
+        "max_half_angle_rad": np.pi,
+        "size": NUM,
+    }
+    _, zd = sc.random.uniform_az_zd_in_cone(prng=prng, **cone)
+    pseudo_error = np.abs(np.mean(np.cos(zd)))
+    assert pseudo_error > 1e-3
+
+    for func in [
+        sc.random.halton_az_zd_in_cone,
+        sc.random.sobol_az_zd_in_cone,
+        sc.random.fibonacci_az_zd_in_cone,
+    ]:
+        _, zd = func(**cone)
+        assert np.abs(np.mean(np.cos(zd))) < pseudo_error / 10
+
+
+def test_power_law_size():
+    prng = np.random.Generator(np.random.PCG64(139))
+    for size in [None, 0, 1, 100]:
+        az, zd, weight = sc.random.cos_weighted_az_zd_in_cone(
+            prng=prng,
+            azimuth_rad=0.0,
+            zenith_rad=0.0,
+            min_half_angle_rad=0.0,
+            max_half_angle_rad=1.0,
+            size=size,
+        )
+        shape = () if size is None else (size,)
+        assert np.shape(az) == shape
+        assert np.shape(zd) == shape
+        assert np.shape(weight) == shape
+
+
+def test_cos_weighted_in_cone():
+    prng = np.random.Generator(np.random.PCG64(140))
+    max_half_angle_rad = np.deg2rad(70)
+    ct2 = np.cos(max_half_angle_rad)
+
+    _, zd, weight = sc.random.cos_weighted_az_zd_in_cone(
+        prng=prng,
+        azimuth_rad=0.0,
+        zenith_rad=0.0,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=max_half_angle_rad,
+        size=1000 * 1000,
+    )
+    assert np.all(zd <= max_half_angle_rad + 1e-9)
+
+    expected_mean_cos = (2 / 3) * (1 - ct2**3) / (1 - ct2**2)
+    np.testing.assert_almost_equal(
+        np.mean(np.cos(zd)), expected_mean_cos, decimal=3
+    )
+
+    # reweighted to be uniform w.r.t. the solid angle
+    np.testing.assert_almost_equal(np.mean(weight), 1.0, decimal=2)
+    np.testing.assert_almost_equal(
+        np.average(np.cos(zd), weights=weight), (1 + ct2) / 2, decimal=3
+    )
+
+
+def test_power_law_in_cone_reweighting():
+    prng = np.random.Generator(np.random.PCG64(141))
+    for power_index in [-1.5, -1.0, 0.0, 2.0, 4.5]:
+        for cone in example_cone_orientations()[0:4]:
+            az, zd, weight = sc.random.power_law_az_zd_in_cone(
+                prng=prng,
+                azimuth_rad=cone["azimuth_rad"],
+                zenith_rad=cone["zenith_rad"],
+                min_half_angle_rad=0.2,
+                max_half_angle_rad=1.2,
+                power_index=power_index,
+                size=100 * 1000,
+            )
+            cos_theta = np.cos(
+                sc.angle_between_az_zd(
+                    azimuth1_rad=az,
+                    zenith1_rad=zd,
+                    azimuth2_rad=cone["azimuth_rad"],
+                    zenith2_rad=cone["zenith_rad"],
+                )
+            )
+            ct1 = np.cos(0.2)
+            ct2 = np.cos(1.2)
+            assert np.all(cos_theta >= ct2 - 1e-9)
+            assert np.all(cos_theta <= ct1 + 1e-9)
+            np.testing.assert_almost_equal(
+                np.average(cos_theta, weights=weight),
+                (ct1 + ct2) / 2,
+                decimal=2,
+            )
+
+
+def test_cos_weighted_in_tilted_cone():
+    prng = np.random.Generator(np.random.PCG64(160))
+    cone = {
+        "azimuth_rad": 0.7,
+        "zenith_rad": np.deg2rad(40),
+        "min_half_angle_rad": np.deg2rad(5),
+        "max_half_angle_rad": np.deg2rad(45),
+    }
+    NUM = 1000 * 1000
+    az, zd, weight = sc.random.cos_weighted_az_zd_in_cone(
+        prng=prng, size=NUM, **cone
+    )
+    offset = sc.angle_between_az_zd(
+        az, zd, cone["azimuth_rad"], cone["zenith_rad"]
+    )
+    assert np.all(offset >= cone["min_half_angle_rad"] - 1e-9)
+    assert np.all(offset <= cone["max_half_angle_rad"] + 1e-9)
+
+    # uniform in the cone weighted with cos(zd) is the flux through the
+    # horizontal plane
+    uaz, uzd = sc.random.uniform_az_zd_in_cone(prng=prng, size=NUM, **cone)
+    ucx, ucy, ucz = sc.az_zd_to_cx_cy_cz(uaz, uzd)
+    cx, cy, cz = sc.az_zd_to_cx_cy_cz(az, zd)
+    for c, uc in [(cx, ucx), (cy, ucy), (cz, ucz)]:
+        np.testing.assert_almost_equal(
+            np.mean(c), np.average(uc, weights=ucz), decimal=3
+        )
+
+    # reweighted to be uniform w.r.t. the solid angle
+    np.testing.assert_almost_equal(np.mean(weight), 1.0, decimal=2)
+    np.testing.assert_almost_equal(
+        np.average(cz, weights=weight), np.mean(ucz), decimal=3
+    )
+
+
+def test_cos_weighted_must_not_reach_below_horizon():
+    with pytest.raises(AssertionError):
+        sc.random.cos_weighted_az_zd_in_cone(
+            prng=np.random.Generator(np.random.PCG64(161)),
+            azimuth_rad=0.0,
+            zenith_rad=1.0,
+            min_half_angle_rad=0.0,
+            max_half_angle_rad=1.0,
+        )
+
+
+def test_power_law_on_full_sphere():
+    prng = np.random.Generator(np.random.PCG64(162))
+    for power_index in [0.0, 2.0]:
+        az, zd, weight = sc.random.power_law_az_zd_in_cone(
+            prng=prng,
+            azimuth_rad=0.0,
+            zenith_rad=0.0,
+            min_half_angle_rad=0.0,
+            max_half_angle_rad=np.pi,
+            power_index=power_index,
+            size=1000 * 1000,
+        )
+        cz = np.cos(zd)
+        # symmetric in cos(theta)
+        np.testing.assert_almost_equal(np.mean(cz), 0.0, decimal=2)
+        expected = 1 / 3 if power_index == 0.0 else 3 / 5
+        np.testing.assert_almost_equal(np.mean(cz**2), expected, decimal=2)
+        if power_index == 0.0:
+            np.testing.assert_array_almost_equal(weight, np.ones(len(cz)))
+
+    with pytest.raises(AssertionError):
+        sc.random.power_law_az_zd_in_cone(
+            prng=prng,
+            azimuth_rad=0.0,
+            zenith_rad=0.0,
+            min_half_angle_rad=0.0,
+            max_half_angle_rad=np.pi,
+            power_index=1.0,
+        )
+
+
+def test_uniform_az_zd_in_box():
+    prng = np.random.Generator(np.random.PCG64(150))
+    box = {
+        "azimuth_start_rad": np.deg2rad(170),
+        "azimuth_stop_rad": np.deg2rad(-150),
+        "zenith_start_rad": np.deg2rad(10),
+        "zenith_stop_rad": np.deg2rad(50),
+    }
+    az, zd = sc.random.uniform_az_zd_in_box(prng=prng, **box)
+    assert np.shape(az) == ()
+
+    NUM = 100 * 1000
+    az, zd = sc.random.uniform_az_zd_in_box(prng=prng, size=NUM, **box)
+    assert np.all(sc.is_az_zd_in_box(az, zd, **box))
+
+    # the box is 40 DEG wide and crosses the seam at 180 DEG
+    az_deg = np.rad2deg(az)
+    np.testing.assert_almost_equal(np.mean(az_deg > 0), 10 / 40, decimal=2)
+
+    # uniform w.r.t. solid angle
+    ct1 = np.cos(box["zenith_start_rad"])
+    ct2 = np.cos(box["zenith_stop_rad"])
+    np.testing.assert_almost_equal(
+        np.median(np.cos(zd)), (ct1 + ct2) / 2, decimal=2
+    )
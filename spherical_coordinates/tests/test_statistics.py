@@ -0,0 +1,103 @@
+import spherical_coordinates as sc
+import numpy as np
+import pickle
+
+
+def draw_cone(prng, size):
+    return sc.random.uniform_az_zd_in_cone(
+        prng=prng,
+        azimuth_rad=0.3,
+        zenith_rad=0.4,
+        min_half_angle_rad=0.0,
+        max_half_angle_rad=np.deg2rad(2.0),
+        size=size,
+    )
+
+
+def test_empty():
+    acc = sc.statistics.init(azimuth_rad=0.0, zenith_rad=0.0)
+    assert acc["num"] == 0
+    assert np.isnan(sc.statistics.mean_resultant_length(acc))
+    assert np.isnan(sc.statistics.containment_offset_rad(acc, 0.68))
+
+
+def test_mean_and_containment():
+    prng = np.random.Generator(np.random.PCG64(142))
+    az, zd = draw_cone(prng=prng, size=1000 * 1000)
+
+    acc = sc.statistics.init(
+        azimuth_rad=0.3, zenith_rad=0.4, max_offset_rad=np.deg2rad(5.0)
+    )
+    for chunk in np.array_split(np.arange(len(az)), 7):
+        sc.statistics.add_az_zd(
+            accumulator=acc, azimuth_rad=az[chunk], zenith_rad=zd[chunk]
+        )
+    assert acc["num"] == len(az)
+
+    mean_az, mean_zd = sc.statistics.mean_az_zd(acc)
+    delta = sc.angle_between_az_zd(mean_az, mean_zd, 0.3, 0.4)
+    assert delta < np.deg2rad(0.01)
+
+    assert 0.999 < sc.statistics.mean_resultant_length(acc) < 1.0
+
+    # uniform in solid angle, so the containment grows with sqrt(fraction)
+    offset = sc.angle_between_az_zd(az, zd, 0.3, 0.4)
+    for fraction in [0.5, 0.68, 0.95]:
+        np.testing.assert_allclose(
+            sc.statistics.containment_offset_rad(acc, fraction),
+            np.quantile(offset, fraction),
+            atol=np.deg2rad(5.0) / 4096,
+        )
+    assert not np.isnan(sc.statistics.containment_offset_rad(acc, 1.0))
+
+
+def test_overflow():
+    acc = sc.statistics.init(
+        azimuth_rad=0.0, zenith_rad=0.0, max_offset_rad=np.deg2rad(1.0)
+    )
+    sc.statistics.add_az_zd(
+        accumulator=acc,
+        azimuth_rad=np.zeros(4),
+        zenith_rad=np.deg2rad([0.1, 0.2, 3.0, 4.0]),
+    )
+    assert acc["offset_counts"][-1] == 2
+    assert sc.statistics.containment_offset_rad(acc, 0.5) < np.deg2rad(1.0)
+    assert np.isnan(sc.statistics.containment_offset_rad(acc, 0.75))
+
+
+def test_non_finite_directions():
+    acc = sc.statistics.init(azimuth_rad=0.0, zenith_rad=0.0)
+    sc.statistics.add_cx_cy_cz(
+        accumulator=acc,
+        cx=[0.0, np.nan, 0.0],
+        cy=[0.0, 0.0, np.inf],
+        cz=[1.0, 1.0, 1.0],
+    )
+    assert acc["num"] == 1
+    assert acc["num_non_finite"] == 2
+    assert np.all(np.isfinite(acc["sum_cx_cy_cz"]))
+    assert np.sum(acc["offset_counts"]) == 1
+    assert sc.statistics.mean_resultant_length(acc) == 1.0
+
+
+def test_merge():
+    prng = np.random.Generator(np.random.PCG64(143))
+    az, zd = draw_cone(prng=prng, size=10 * 1000)
+
+    full = sc.statistics.init(azimuth_rad=0.3, zenith_rad=0.4)
+    sc.statistics.add_az_zd(accumulator=full, azimuth_rad=az, zenith_rad=zd)
+
+    a = sc.statistics.init(azimuth_rad=0.3, zenith_rad=0.4)
+    b = sc.statistics.init(azimuth_rad=0.3, zenith_rad=0.4)
+    sc.statistics.add_az_zd(a, azimuth_rad=az[:3000], zenith_rad=zd[:3000])
+    sc.statistics.add_az_zd(b, azimuth_rad=az[3000:], zenith_rad=zd[3000:])
+    b = pickle.loads(pickle.dumps(b))
+
+    merged = sc.statistics.merge(a, b)
+    assert merged["num"] == full["num"]
+    np.testing.assert_array_equal(
+        merged["offset_counts"], full["offset_counts"]
+    )
+    np.testing.assert_array_almost_equal(
+        merged["sum_cx_cy_cz"], full["sum_cx_cy_cz"]
+    )
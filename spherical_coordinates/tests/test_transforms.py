@@ -294,3 +294,37 @@ def test_different_dimensionality():
     assert isinstance(angles, np.ndarray)
     assert angles.shape[0] == 5
     assert len(angles.shape) == 1
+
+
+def test_is_az_zd_in_box():
+    PI = np.pi
+    box = {
+        "azimuth_start_rad": 0.9 * PI,
+        "azimuth_stop_rad": -0.9 * PI,
+        "zenith_start_rad": 0.1,
+        "zenith_stop_rad": 0.2,
+    }
+    assert sphcors.is_az_zd_in_box(PI, 0.15, **box)
+    assert sphcors.is_az_zd_in_box(-PI, 0.15, **box)
+    assert sphcors.is_az_zd_in_box(0.95 * PI, 0.15, **box)
+    assert sphcors.is_az_zd_in_box(-0.95 * PI + 4 * PI, 0.15, **box)
+    assert not sphcors.is_az_zd_in_box(0.0, 0.15, **box)
+    assert not sphcors.is_az_zd_in_box(PI, 0.25, **box)
+    assert not sphcors.is_az_zd_in_box(PI, 0.05, **box)
+
+    az = np.array([PI, 0.0, -0.95 * PI, 0.5 * PI])
+    zd = np.array([0.15, 0.15, 0.15, 0.15])
+    out = np.zeros(4, dtype=bool)
+    res = sphcors.is_az_zd_in_box(az, zd, out=out, **box)
+    assert res is out
+    np.testing.assert_array_equal(out, [True, False, True, False])
+
+    # full circle in azimuth
+    assert sphcors.is_az_zd_in_box(
+        azimuth_rad=1.0,
+        zenith_rad=0.5,
+        azimuth_start_rad=-PI,
+        azimuth_stop_rad=PI,
+        zenith_start_rad=0.0,
+        zenith_stop_rad=1.0,
+    )